@@ -13,7 +13,12 @@ SETTINGS_PATH = APP_DIR / "settings.json"
 # ---- Debug / runtime tuning ----
 DEBUG_STOP_WORD_OCR = False   # True = print OCR debug to console
 STOP_WORD_POLL_SEC = 10.0     # poll interval for stop-word checks (seconds)
+STOP_WORD_POLL_BACKOFF = 1.5  # stop-word interval multiplier after each miss
+STOP_WORD_POLL_MAX_FACTOR = 5.0  # backoff cap, relative to the configured interval
+WAIT_EVENT_POLL_BACKOFF = 1.5   # WaitEvent probe interval multiplier after each miss
+WAIT_EVENT_POLL_MAX_SEC = 5.0   # backoff cap (never below the action's own poll)
 FOCUS_POLL_SEC = 0.5          # how often to restore focus to the game
+WINDOW_STATE_TTL_SEC = 0.05   # reuse one bound-window poll (hwnd/rect/dpi/focus) this long
 
 # Flag for blocking global hotkeys during key capture.
 CAPTURE_OVERLAY_ACTIVE = False
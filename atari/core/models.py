@@ -22,11 +22,11 @@ class Delay:
     a: float = 0.0
     b: float = 0.0  # used only for range
 
-    def sample(self) -> float:
+    def sample(self, rng: Optional[random.Random] = None) -> float:
         if self.mode == "range":
             lo = min(self.a, self.b)
             hi = max(self.a, self.b)
-            return random.uniform(lo, hi)
+            return (rng or random).uniform(lo, hi)
         return max(0.0, float(self.a))
 
     def to_dict(self) -> Dict[str, Any]:
@@ -251,6 +251,17 @@ class WordAreaAction:
     on_fail_actions: List[Dict[str, Any]] = field(default_factory=list)
     on_fail_post_mode: Literal["none", "stop", "repeat"] = "none"
 
+    def __post_init__(self):
+        # Single place that validates search settings: from_dict passes raw values
+        # through, and the player reads the fields directly.
+        try:
+            self.search_max_tries = max(1, int(self.search_max_tries))
+        except Exception:
+            self.search_max_tries = 100
+        self.search_infinite = bool(self.search_infinite)
+        if self.search_on_fail not in ("retry", "error", "action"):
+            self.search_on_fail = "retry"
+
     def search_rect_abs(self) -> QRect:
         return QRect(QPoint(self.x1, self.y1), QPoint(self.x2, self.y2)).normalized()
 
@@ -333,15 +344,6 @@ class WordAreaAction:
             if count < 1:
                 count = 0
 
-        try:
-            search_max_tries = int(d.get("search_max_tries", 100))
-        except Exception:
-            search_max_tries = 100
-        if search_max_tries < 1:
-            search_max_tries = 1
-        search_on_fail = str(d.get("search_on_fail", "retry") or "retry")
-        if search_on_fail not in ("retry", "error", "action"):
-            search_on_fail = "retry"
         ofa_raw = d.get("on_fail_actions", [])
         if isinstance(ofa_raw, list):
             on_fail_actions = [copy.deepcopy(x) for x in ofa_raw if isinstance(x, dict)]
@@ -367,8 +369,9 @@ class WordAreaAction:
             trigger=trig,
             ocr_lang=str(d.get("ocr_lang", "rus") or "rus"),
             search_infinite=bool(d.get("search_infinite", True)),
-            search_max_tries=search_max_tries,
-            search_on_fail=search_on_fail,
+            # search_* are normalized by __post_init__
+            search_max_tries=d.get("search_max_tries", 100),
+            search_on_fail=d.get("search_on_fail", "retry"),
             on_fail_actions=on_fail_actions,
             on_fail_post_mode=on_fail_post_mode,
         )
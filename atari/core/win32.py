@@ -39,6 +39,9 @@ if _is_windows():
     _user32.IsIconic.argtypes = [wintypes.HWND]
     _user32.IsIconic.restype = wintypes.BOOL
 
+    _user32.IsWindow.argtypes = [wintypes.HWND]
+    _user32.IsWindow.restype = wintypes.BOOL
+
     _user32.GetForegroundWindow.argtypes = []
     _user32.GetForegroundWindow.restype = wintypes.HWND
 
@@ -115,6 +118,16 @@ def _win_pid_from_hwnd(hwnd: int) -> int:
     return int(pid.value)
 
 
+def _win_hwnd_alive(hwnd: int, pid: int = 0) -> bool:
+    """Окно ещё живо, видимо, не свёрнуто и (если задан pid) принадлежит тому же процессу."""
+    if not _is_windows() or not hwnd:
+        return False
+    h = wintypes.HWND(int(hwnd))
+    if not _user32.IsWindow(h) or not _user32.IsWindowVisible(h) or _user32.IsIconic(h):
+        return False
+    return not pid or _win_pid_from_hwnd(hwnd) == pid
+
+
 def _win_exe_from_pid(pid: int) -> str:
     if not _is_windows() or pid <= 0 or not _QueryFullProcessImageNameW:
         return ""
@@ -8,14 +8,24 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
+try:
+    # Optional faster engine for the simple module-level scanners below.
+    import regex as _scan_re
+except ImportError:
+    _scan_re = re
+
 DEFAULT_LANGUAGE = "en"
 SUPPORTED_LANGUAGES: Tuple[str, ...] = ("en", "ru")
 
-_PLACEHOLDER_RE = re.compile(r"\{(\d+)\}")
-_CYR_RE = re.compile(r"[\u0400-\u04FF]")
+_PLACEHOLDER_RE = _scan_re.compile(r"\{(\d+)\}")
+_PLACEHOLDER_FINDITER = _PLACEHOLDER_RE.finditer
+_CYR_RE = _scan_re.compile(r"[\u0400-\u04FF]")
+_CYR_SEARCH = _CYR_RE.search
 _CURRENT_LANGUAGE = DEFAULT_LANGUAGE
 _DATA_LOADED = False
-_CACHE: Dict[Tuple[str, str], str] = {}
+_CACHE: Dict[Tuple[str, str], Any] = {}
+# Cached marker for strings that translate to themselves.
+_IDENTITY = object()
 
 _RU_TO_EN_EXACT: Dict[str, str] = {}
 _EN_TO_RU_EXACT: Dict[str, str] = {}
@@ -45,11 +55,42 @@ _MANUAL_RU_TO_EN: Dict[str, str] = {
 class _TemplateRule:
     pattern: re.Pattern[str]
     target_template: str
+    # Target split into (False, literal) / (True, placeholder index) parts.
+    target_segments: Tuple[Tuple[bool, Any], ...] = ()
 
 
 _RU_TO_EN_TPL: List[_TemplateRule] = []
 _EN_TO_RU_TPL: List[_TemplateRule] = []
 
+try:
+    from PySide6.QtGui import QAction
+    from PySide6.QtWidgets import (
+        QAbstractButton,
+        QCheckBox,
+        QComboBox,
+        QFileDialog,
+        QGroupBox,
+        QInputDialog,
+        QLabel,
+        QLineEdit,
+        QListWidget,
+        QListWidgetItem,
+        QMessageBox,
+        QMenu,
+        QPushButton,
+        QTableWidget,
+        QTableWidgetItem,
+        QToolButton,
+        QWidget,
+    )
+
+    _HAS_QT = True
+except Exception:
+    # Text translation still works without Qt; only the widget helpers are disabled.
+    _HAS_QT = False
+
+_CLASS_TEXT_ACCESSORS: Dict[type, Tuple[Tuple[str, str], ...]] = {}
+
 _QT_HOOKS_INSTALLED = False
 _ORIGINAL_QT: Dict[Tuple[str, str], Any] = {}
 
@@ -81,19 +122,30 @@ def _data_path() -> Path:
     return Path(__file__).with_name("i18n_data.json")
 
 
-def _render_template(template: str, values: Dict[int, str]) -> str:
-    def _replace(m: re.Match[str]) -> str:
-        idx = int(m.group(1))
-        return values.get(idx, m.group(0))
+def _split_template(template: str) -> Tuple[Tuple[bool, Any], ...]:
+    segments: List[Tuple[bool, Any]] = []
+    pos = 0
+    for m in _PLACEHOLDER_FINDITER(template):
+        if m.start() > pos:
+            segments.append((False, template[pos : m.start()]))
+        segments.append((True, int(m.group(1))))
+        pos = m.end()
+    if pos < len(template):
+        segments.append((False, template[pos:]))
+    return tuple(segments)
+
 
-    return _PLACEHOLDER_RE.sub(_replace, template)
+def _render_segments(segments: Iterable[Tuple[bool, Any]], values: Dict[int, str]) -> str:
+    return "".join(
+        str(values.get(v, "{" + str(v) + "}")) if is_idx else v for is_idx, v in segments
+    )
 
 
 def _compile_template(source_template: str, target_template: str) -> _TemplateRule:
     parts: List[str] = []
     seen: set[int] = set()
     pos = 0
-    for m in _PLACEHOLDER_RE.finditer(source_template):
+    for m in _PLACEHOLDER_FINDITER(source_template):
         parts.append(re.escape(source_template[pos : m.start()]))
         idx = int(m.group(1))
         name = f"v{idx}"
@@ -105,7 +157,11 @@ def _compile_template(source_template: str, target_template: str) -> _TemplateRu
         pos = m.end()
     parts.append(re.escape(source_template[pos:]))
     regex = re.compile("^" + "".join(parts) + "$", re.DOTALL)
-    return _TemplateRule(pattern=regex, target_template=target_template)
+    return _TemplateRule(
+        pattern=regex,
+        target_template=target_template,
+        target_segments=_split_template(target_template),
+    )
 
 
 def _template_weight(item: Tuple[str, str]) -> Tuple[int, int]:
@@ -129,7 +185,8 @@ def _preserve_edge_spaces(src: str, dst: str) -> str:
 
 def _reverse_source_score(src: str) -> Tuple[int, int, int, int]:
     # Prefer readable native text over corrupted placeholders.
-    has_cyr = 1 if _CYR_RE.search(src) else 0
+    # Called once per source key, so the cyrillic scan stays inline.
+    has_cyr = 1 if _CYR_SEARCH(src) else 0
     qmarks = src.count("?")
     return (has_cyr, -qmarks, 1 if qmarks == 0 else 0, len(src))
 
@@ -167,15 +224,14 @@ def _load_data() -> None:
     for src, dst in _MANUAL_RU_TO_EN.items():
         _RU_TO_EN_EXACT[src] = dst
 
-    _EN_TO_RU_EXACT.clear()
-    reverse_best: Dict[str, Tuple[str, Tuple[int, int, int, int]]] = {}
+    # Single pass: keep the best-scoring source per target with a parallel score map.
+    reverse_score: Dict[str, Tuple[int, int, int, int]] = {}
     for src, dst in _RU_TO_EN_EXACT.items():
         cand_score = _reverse_source_score(src)
-        prev = reverse_best.get(dst)
-        if prev is None or cand_score > prev[1]:
-            reverse_best[dst] = (src, cand_score)
-    for dst, pair in reverse_best.items():
-        _EN_TO_RU_EXACT[dst] = pair[0]
+        prev_score = reverse_score.get(dst)
+        if prev_score is None or cand_score > prev_score:
+            reverse_score[dst] = cand_score
+            _EN_TO_RU_EXACT[dst] = src
 
     tpl_items = [(str(k), _preserve_edge_spaces(str(k), str(v))) for k, v in ru_to_en_tpl.items()]
     tpl_items.sort(key=_template_weight, reverse=True)
@@ -228,7 +284,7 @@ def _translate_by_templates(
                 values[idx] = str(translate_text(val, target_language))
             else:
                 values[idx] = val
-        return _render_template(rule.target_template, values)
+        return _render_segments(rule.target_segments, values)
     return None
 
 
@@ -244,31 +300,28 @@ def translate_text(value: Any, target_language: Optional[str] = None) -> Any:
     if not isinstance(value, str) or not value:
         return value
 
-    _load_data()
+    if not _DATA_LOADED:
+        _load_data()
     lang = normalize_language(target_language or _CURRENT_LANGUAGE)
     key = (lang, value)
     cached = _CACHE.get(key)
     if cached is not None:
-        return cached
+        return value if cached is _IDENTITY else cached
 
     if lang == "ru":
-        out = _EN_TO_RU_EXACT.get(value)
-        if out is None:
-            out = _translate_by_templates(value, _EN_TO_RU_TPL, target_language="ru")
-        if out is None:
-            frag = _replace_fragments(value, _EN_TO_RU_FRAG)
-            out = frag if frag != value else None
-        if out is None:
-            out = value
+        exact, templates, fragments = _EN_TO_RU_EXACT, _EN_TO_RU_TPL, _EN_TO_RU_FRAG
     else:
-        out = _RU_TO_EN_EXACT.get(value)
-        if out is None:
-            out = _translate_by_templates(value, _RU_TO_EN_TPL, target_language="en")
-        if out is None:
-            frag = _replace_fragments(value, _RU_TO_EN_FRAG)
-            out = frag if frag != value else None
-        if out is None:
-            out = value
+        exact, templates, fragments = _RU_TO_EN_EXACT, _RU_TO_EN_TPL, _RU_TO_EN_FRAG
+
+    out = exact.get(value)
+    if out is None:
+        out = _translate_by_templates(value, templates, target_language=lang)
+    if out is None:
+        frag = _replace_fragments(value, fragments)
+        out = frag if frag != value else None
+    if out is None or out == value:
+        _CACHE[key] = _IDENTITY
+        return value
 
     _CACHE[key] = out
     return out
@@ -294,112 +347,68 @@ def install_qt_translation_hooks() -> None:
     if _QT_HOOKS_INSTALLED:
         return
 
-    try:
-        from PySide6.QtGui import QAction
-        from PySide6.QtWidgets import (
-            QAbstractButton,
-            QCheckBox,
-            QComboBox,
-            QFileDialog,
-            QGroupBox,
-            QInputDialog,
-            QLabel,
-            QLineEdit,
-            QListWidgetItem,
-            QMessageBox,
-            QMenu,
-            QPushButton,
-            QTableWidget,
-            QTableWidgetItem,
-            QToolButton,
-            QWidget,
-        )
-    except Exception:
+    if not _HAS_QT:
         return
 
+    _tr = translate_text
+
+    # Each wrapper is specialized for the argument shape of the patched method,
+    # so the per-call path only touches the positions that can carry text.
     def _wrap_text_arg0(original):
         def _patched(self, text, *args, **kwargs):
-            return original(self, translate_text(text), *args, **kwargs)
+            return original(self, _tr(text), *args, **kwargs)
 
         return _patched
 
     def _wrap_list_arg0(original):
         def _patched(self, labels, *args, **kwargs):
             if isinstance(labels, (list, tuple)):
-                labels = [translate_text(x) for x in labels]
+                labels = [_tr(x) for x in labels]
             return original(self, labels, *args, **kwargs)
 
         return _patched
 
-    def _wrap_qtable_item_init(original):
-        def _patched(self, *args, **kwargs):
-            a = list(args)
-            if a and isinstance(a[0], str):
-                a[0] = translate_text(a[0])
-            if len(a) >= 2 and not isinstance(a[0], str) and isinstance(a[1], str):
-                a[1] = translate_text(a[1])
-            if isinstance(kwargs.get("text"), str):
-                kwargs["text"] = translate_text(kwargs["text"])
-            return original(self, *tuple(a), **kwargs)
+    def _translate_leading_text(args):
+        # Text is either the first argument or follows a leading icon/parent.
+        first = args[0]
+        if isinstance(first, str):
+            return (_tr(first),) + args[1:]
+        if len(args) >= 2 and isinstance(args[1], str):
+            return (first, _tr(args[1])) + args[2:]
+        return args
 
-        return _patched
-
-    def _wrap_translate_text_init(original):
+    def _wrap_leading_text(original):
         def _patched(self, *args, **kwargs):
-            a = list(args)
-            for idx in (0, 1):
-                if idx < len(a) and isinstance(a[idx], str):
-                    a[idx] = translate_text(a[idx])
-            return original(self, *tuple(a), **kwargs)
+            if args:
+                args = _translate_leading_text(args)
+            return original(self, *args, **kwargs)
 
         return _patched
 
-    def _wrap_qlist_item_init(original):
+    def _wrap_leading_text_kw(original):
         def _patched(self, *args, **kwargs):
-            a = list(args)
-            if a and isinstance(a[0], str):
-                a[0] = translate_text(a[0])
-            if len(a) >= 2 and not isinstance(a[0], str) and isinstance(a[1], str):
-                a[1] = translate_text(a[1])
-            return original(self, *tuple(a), **kwargs)
-
-        return _patched
-
-    def _wrap_menu_add_action(original):
-        def _patched(self, *args, **kwargs):
-            a = list(args)
-            if a and isinstance(a[0], str):
-                a[0] = translate_text(a[0])
-            if len(a) >= 2 and not isinstance(a[0], str) and isinstance(a[1], str):
-                a[1] = translate_text(a[1])
-            if isinstance(kwargs.get("text"), str):
-                kwargs["text"] = translate_text(kwargs["text"])
-            return original(self, *tuple(a), **kwargs)
+            if args:
+                args = _translate_leading_text(args)
+            text = kwargs.get("text")
+            if isinstance(text, str):
+                kwargs["text"] = _tr(text)
+            return original(self, *args, **kwargs)
 
         return _patched
 
-    def _wrap_combo_add_item(original):
+    def _wrap_translate_text_init(original):
         def _patched(self, *args, **kwargs):
             a = list(args)
-            if a and isinstance(a[0], str):
-                a[0] = translate_text(a[0])
-            if len(a) >= 2 and not isinstance(a[0], str) and isinstance(a[1], str):
-                a[1] = translate_text(a[1])
+            for idx in (0, 1):
+                if idx < len(a) and isinstance(a[idx], str):
+                    a[idx] = _tr(a[idx])
             return original(self, *tuple(a), **kwargs)
 
         return _patched
 
-    def _wrap_combo_add_items(original):
-        def _patched(self, items, *args, **kwargs):
-            if isinstance(items, (list, tuple)):
-                items = [translate_text(x) for x in items]
-            return original(self, items, *args, **kwargs)
-
-        return _patched
-
     def _wrap_qmessagebox_static(original):
         def _patched(parent, title, text, *args, **kwargs):
-            return original(parent, translate_text(title), translate_text(text), *args, **kwargs)
+            return original(parent, _tr(title), _tr(text), *args, **kwargs)
 
         return staticmethod(_patched)
 
@@ -407,13 +416,13 @@ def install_qt_translation_hooks() -> None:
         def _patched(*args, **kwargs):
             a = list(args)
             if len(a) >= 2 and isinstance(a[1], str):
-                a[1] = translate_text(a[1])
+                a[1] = _tr(a[1])
             if len(a) >= 4 and isinstance(a[3], str):
-                a[3] = translate_text(a[3])
+                a[3] = _tr(a[3])
             if isinstance(kwargs.get("caption"), str):
-                kwargs["caption"] = translate_text(kwargs["caption"])
+                kwargs["caption"] = _tr(kwargs["caption"])
             if isinstance(kwargs.get("filter"), str):
-                kwargs["filter"] = translate_text(kwargs["filter"])
+                kwargs["filter"] = _tr(kwargs["filter"])
             return original(*tuple(a), **kwargs)
 
         return staticmethod(_patched)
@@ -426,13 +435,13 @@ def install_qt_translation_hooks() -> None:
     _patch_qt_method(QLineEdit, "setPlaceholderText", _wrap_text_arg0)
     _patch_qt_method(QInputDialog, "setLabelText", _wrap_text_arg0)
     _patch_qt_method(QTableWidget, "setHorizontalHeaderLabels", _wrap_list_arg0)
-    _patch_qt_method(QTableWidgetItem, "__init__", _wrap_qtable_item_init)
+    _patch_qt_method(QTableWidgetItem, "__init__", _wrap_leading_text_kw)
     _patch_qt_method(QTableWidgetItem, "setText", _wrap_text_arg0)
-    _patch_qt_method(QListWidgetItem, "__init__", _wrap_qlist_item_init)
+    _patch_qt_method(QListWidgetItem, "__init__", _wrap_leading_text)
     _patch_qt_method(QListWidgetItem, "setText", _wrap_text_arg0)
-    _patch_qt_method(QMenu, "addAction", _wrap_menu_add_action)
-    _patch_qt_method(QComboBox, "addItem", _wrap_combo_add_item)
-    _patch_qt_method(QComboBox, "addItems", _wrap_combo_add_items)
+    _patch_qt_method(QMenu, "addAction", _wrap_leading_text_kw)
+    _patch_qt_method(QComboBox, "addItem", _wrap_leading_text)
+    _patch_qt_method(QComboBox, "addItems", _wrap_list_arg0)
     _patch_qt_method(QComboBox, "setItemText", _wrap_text_arg0)
     _patch_qt_method(QLabel, "__init__", _wrap_translate_text_init)
     _patch_qt_method(QPushButton, "__init__", _wrap_translate_text_init)
@@ -453,7 +462,7 @@ def install_qt_translation_hooks() -> None:
     _QT_HOOKS_INSTALLED = True
 
 
-def _retranslate_action_tree(actions: Iterable[Any]) -> None:
+def _retranslate_action_tree(actions: Iterable[Any], pending: List[Any]) -> None:
     for act in actions:
         try:
             act.setText(act.text())
@@ -464,116 +473,123 @@ def _retranslate_action_tree(actions: Iterable[Any]) -> None:
         except Exception:
             submenu = None
         if submenu is not None:
-            retranslate_widget_tree(submenu)
-
+            pending.append(submenu)
 
-def retranslate_widget_tree(root: Any) -> None:
-    """Re-apply text values for all known widgets to update active language."""
-    if root is None:
-        return
 
-    try:
-        from PySide6.QtWidgets import (
-            QComboBox,
-            QGroupBox,
-            QLineEdit,
-            QListWidget,
-            QMenu,
-            QTableWidget,
-            QWidget,
-        )
-    except Exception:
-        return
-
-    queue: List[Any] = []
-    try:
-        queue.append(root)
-        if isinstance(root, QWidget):
-            queue.extend(root.findChildren(QWidget))
-    except Exception:
-        pass
+def _text_accessors(cls: type) -> Tuple[Tuple[str, str], ...]:
+    """Return (getter, setter) names the class supports, probed once per class."""
+    cached = _CLASS_TEXT_ACCESSORS.get(cls)
+    if cached is not None:
+        return cached
+    pairs: List[Tuple[str, str]] = [("windowTitle", "setWindowTitle"), ("text", "setText")]
+    if issubclass(cls, QGroupBox):
+        pairs.append(("title", "setTitle"))
+    if issubclass(cls, QLineEdit):
+        pairs.append(("placeholderText", "setPlaceholderText"))
+    cached = tuple(
+        (getter, setter)
+        for getter, setter in pairs
+        if callable(getattr(cls, getter, None)) and callable(getattr(cls, setter, None))
+    )
+    _CLASS_TEXT_ACCESSORS[cls] = cached
+    return cached
+
+
+def _retranslate_widget(widget: Any, pending: List[Any]) -> None:
+    # Window title, main text, group title, placeholder.
+    for getter, setter in _text_accessors(type(widget)):
+        try:
+            value = getattr(widget, getter)()
+            if isinstance(value, str):
+                getattr(widget, setter)(value)
+        except Exception:
+            pass
 
-    for widget in queue:
-        # Window title
+    if isinstance(widget, QComboBox):
         try:
-            title = widget.windowTitle()
-            if isinstance(title, str):
-                widget.setWindowTitle(title)
+            for i in range(widget.count()):
+                widget.setItemText(i, widget.itemText(i))
         except Exception:
             pass
 
-        # Main text
+    if isinstance(widget, QListWidget):
         try:
-            text = widget.text()
-            if isinstance(text, str):
-                widget.setText(text)
+            for i in range(widget.count()):
+                it = widget.item(i)
+                if it is not None:
+                    it.setText(it.text())
         except Exception:
             pass
 
-        if isinstance(widget, QGroupBox):
-            try:
-                widget.setTitle(widget.title())
-            except Exception:
-                pass
+    if isinstance(widget, QTableWidget):
+        try:
+            labels: List[str] = []
+            for c in range(widget.columnCount()):
+                item = widget.horizontalHeaderItem(c)
+                labels.append(item.text() if item is not None else "")
+            if labels:
+                widget.setHorizontalHeaderLabels(labels)
+        except Exception:
+            pass
+        try:
+            for r in range(widget.rowCount()):
+                for c in range(widget.columnCount()):
+                    item = widget.item(r, c)
+                    if item is not None:
+                        item.setText(item.text())
+        except Exception:
+            pass
 
-        if isinstance(widget, QLineEdit):
-            try:
-                widget.setPlaceholderText(widget.placeholderText())
-            except Exception:
-                pass
+    if isinstance(widget, QMenu):
+        try:
+            _retranslate_action_tree(widget.actions(), pending)
+        except Exception:
+            pass
 
-        if isinstance(widget, QComboBox):
-            try:
-                for i in range(widget.count()):
-                    widget.setItemText(i, widget.itemText(i))
-            except Exception:
-                pass
+    # ToolButton/QPushButton menus are not always children in hierarchy.
+    menu_getter = getattr(widget, "menu", None)
+    if not callable(menu_getter):
+        return
+    try:
+        menu = menu_getter()
+    except Exception:
+        menu = None
+    if menu is not None:
+        pending.append(menu)
 
-        if isinstance(widget, QListWidget):
-            try:
-                for i in range(widget.count()):
-                    it = widget.item(i)
-                    if it is not None:
-                        it.setText(it.text())
-            except Exception:
-                pass
 
-        if isinstance(widget, QTableWidget):
-            try:
-                labels: List[str] = []
-                for c in range(widget.columnCount()):
-                    item = widget.horizontalHeaderItem(c)
-                    labels.append(item.text() if item is not None else "")
-                if labels:
-                    widget.setHorizontalHeaderLabels(labels)
-            except Exception:
-                pass
-            try:
-                for r in range(widget.rowCount()):
-                    for c in range(widget.columnCount()):
-                        item = widget.item(r, c)
-                        if item is not None:
-                            item.setText(item.text())
-            except Exception:
-                pass
+def retranslate_widget_tree(root: Any) -> None:
+    """Re-apply text values for all known widgets to update active language."""
+    if root is None or not _HAS_QT:
+        return
 
-        if isinstance(widget, QMenu):
-            try:
-                _retranslate_action_tree(widget.actions())
-            except Exception:
-                pass
+    # Detached menus (button menus, action submenus) are queued as extra roots
+    # and expanded with their own findChildren(); `seen` keeps each node single-pass
+    # and holds references so ids stay unique during the walk.
+    roots: List[Any] = [root]
+    seen: Dict[int, Any] = {}
 
-        # ToolButton/QPushButton menus are not always children in hierarchy.
+    # Root can be QMenu (not QWidget child traversal in some cases).
+    if not isinstance(root, QMenu):
         try:
-            menu = widget.menu()
+            if hasattr(root, "actions"):
+                _retranslate_action_tree(root.actions(), roots)
         except Exception:
-            menu = None
-        if menu is not None:
-            retranslate_widget_tree(menu)
+            pass
 
-    # Root can be QMenu (not QWidget child traversal in some cases).
-    try:
-        if hasattr(root, "actions"):
-            _retranslate_action_tree(root.actions())
-    except Exception:
-        pass
+    while roots:
+        sub_root = roots.pop()
+        if id(sub_root) in seen:
+            continue
+        queue: List[Any] = [sub_root]
+        try:
+            if isinstance(sub_root, QWidget):
+                queue.extend(sub_root.findChildren(QWidget))
+        except Exception:
+            pass
+        for widget in queue:
+            key = id(widget)
+            if key in seen:
+                continue
+            seen[key] = widget
+            _retranslate_widget(widget, roots)
@@ -4,9 +4,10 @@
 
 import threading
 import time
-from typing import Optional
+from array import array
+from typing import Dict, List, Optional, Tuple
 
-from PySide6.QtCore import QObject, Signal
+from PySide6.QtCore import QObject, QTimer, Signal
 
 class GlobalHotkeyListener(QObject):
     esc_pressed = Signal()
@@ -28,20 +29,21 @@ class GlobalHotkeyListener(QObject):
         except Exception:
             return
 
+        dispatch = {
+            keyboard.Key.esc: self.esc_pressed.emit,
+            keyboard.Key.f1: self.f1_pressed.emit,
+            keyboard.Key.f2: self.f2_pressed.emit,
+            keyboard.Key.f3: self.f3_pressed.emit,
+            keyboard.Key.f4: self.f4_pressed.emit,
+            keyboard.Key.f5: self.f5_pressed.emit,
+        }
+
         def on_press(key):
+            emit = dispatch.get(key)
+            if emit is None:
+                return
             try:
-                if key == keyboard.Key.esc:
-                    self.esc_pressed.emit()
-                elif key == keyboard.Key.f1:
-                    self.f1_pressed.emit()
-                elif key == keyboard.Key.f2:
-                    self.f2_pressed.emit()
-                elif key == keyboard.Key.f3:
-                    self.f3_pressed.emit()
-                elif key == keyboard.Key.f4:
-                    self.f4_pressed.emit()
-                elif key == keyboard.Key.f5:
-                    self.f5_pressed.emit()
+                emit()
             except Exception:
                 pass
 
@@ -61,9 +63,15 @@ class GlobalHotkeyListener(QObject):
 
 
 class IntervalMeter(QObject):
-    interval = Signal(float, str, int)  # dt_sec, name, index
+    interval_batch = Signal(list)  # [(dt_sec, name, index), ...]
     status = Signal(str)
     stopped = Signal()
+    _flush_requested = Signal()
+
+    FLUSH_INTERVAL_MS = 16  # интервалы уходят в GUI пачками, не чаще ~60 Гц
+
+    VK_BIT_LIMIT = 512  # larger vk codes (e.g. X11 keysyms) use the set filter
+    MIN_INTERVAL_NS = 5_000_000  # 5 мс: короче — дубль от драйвера/хука, не реальное нажатие
 
     def __init__(self):
         super().__init__()
@@ -77,12 +85,25 @@ class IntervalMeter(QObject):
         self._target_kind: Optional[str] = None  # "key" | "mouse"
         self._target_sig: Optional[tuple] = None
 
-        self._last_ts: Optional[float] = None
-        self.intervals: List[float] = []
+        self._last_ts: Optional[int] = None  # perf_counter_ns
+        self.intervals = array("q")  # ns, плоский int64-буфер
         self._count = 0
-
+        self._pending: List[Tuple[float, str, int]] = []
+
+        # таймер живёт в GUI-потоке; слушатели взводят его через queued-сигнал
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(self.FLUSH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self._flush_pending)
+        self._flush_requested.connect(self._flush_timer.start)
+
+        # Held-down filters: one bit per virtual-key / mouse button; the sets are
+        # only used for keys without a small vk code and unmapped buttons.
+        self._keys_mask = 0
         self._keys_down = set()
+        self._mouse_mask = 0
         self._mouse_down = set()
+        self._mouse_bits: Dict[object, int] = {}
 
     # ---- normalize / pretty ----
     def _key_sig(self, kb, key) -> tuple:
@@ -106,6 +127,15 @@ class IntervalMeter(QObject):
             return ("vk", int(vk))
         return ("str", str(key))
 
+    def _key_bit(self, key) -> int:
+        vk = getattr(key, "vk", None)
+        if vk is None:
+            # Key (special) wraps its KeyCode in .value
+            vk = getattr(getattr(key, "value", None), "vk", None)
+        if isinstance(vk, int) and 0 <= vk < self.VK_BIT_LIMIT:
+            return 1 << vk
+        return 0
+
     def _mouse_sig(self, button) -> tuple:
         return ("mouse", button)
 
@@ -143,47 +173,75 @@ class IntervalMeter(QObject):
                 self.status.emit(f"Замер: ошибка pynput: {ex}")
                 return
 
+            kb = keyboard
+            key_f8 = kb.Key.f8
+            # не ловим хоткеи приложения, чтобы не мешали
+            app_hotkeys = frozenset((kb.Key.esc, kb.Key.f1, kb.Key.f2, kb.Key.f3, kb.Key.f4, kb.Key.f5))
+
             def on_key_press(key):
-                from pynput import keyboard as kb
+                ts = time.perf_counter_ns()
 
                 # F8 — стоп
-                if key == kb.Key.f8:
+                if key == key_f8:
                     self.stop()
                     return
 
-                # не ловим хоткеи приложения, чтобы не мешали
-                if key in (kb.Key.esc, kb.Key.f1, kb.Key.f2, kb.Key.f3, kb.Key.f4, kb.Key.f5):
+                if key in app_hotkeys:
                     return
 
-                sig = self._key_sig(kb, key)
-
                 # фильтр автоповтора: пока держишь клавишу — не спамим
-                with self._lock:
-                    if sig in self._keys_down:
-                        return
-                    self._keys_down.add(sig)
+                bit = self._key_bit(key)
+                if bit:
+                    with self._lock:
+                        if self._keys_mask & bit:
+                            return
+                        self._keys_mask |= bit
+                    sig = self._key_sig(kb, key)
+                else:
+                    sig = self._key_sig(kb, key)
+                    with self._lock:
+                        if sig in self._keys_down:
+                            return
+                        self._keys_down.add(sig)
 
-                self._handle_event(kind="key", sig=sig, name=self._key_to_name(key))
+                self._handle_event(kind="key", sig=sig, name=self._key_to_name(key), ts=ts)
 
             def on_key_release(key):
-                from pynput import keyboard as kb
+                bit = self._key_bit(key)
+                if bit:
+                    with self._lock:
+                        self._keys_mask &= ~bit
+                    return
                 sig = self._key_sig(kb, key)
                 with self._lock:
                     self._keys_down.discard(sig)
 
+            mouse_bits = self._mouse_bits
+            if not mouse_bits:
+                mouse_bits.update({b: 1 << i for i, b in enumerate(mouse.Button)})
+
             def on_click(x, y, button, pressed):
                 # считаем только "нажатие", отпускание нужно для анти-дребезга
+                ts = time.perf_counter_ns()
+                bit = mouse_bits.get(button, 0)
+                sig = self._mouse_sig(button)
                 if pressed:
-                    sig = self._mouse_sig(button)
                     with self._lock:
-                        if sig in self._mouse_down:
-                            return
-                        self._mouse_down.add(sig)
-                    self._handle_event(kind="mouse", sig=sig, name=self._mouse_to_name(button))
+                        if bit:
+                            if self._mouse_mask & bit:
+                                return
+                            self._mouse_mask |= bit
+                        else:
+                            if sig in self._mouse_down:
+                                return
+                            self._mouse_down.add(sig)
+                    self._handle_event(kind="mouse", sig=sig, name=self._mouse_to_name(button), ts=ts)
                 else:
-                    sig = self._mouse_sig(button)
                     with self._lock:
-                        self._mouse_down.discard(sig)
+                        if bit:
+                            self._mouse_mask &= ~bit
+                        else:
+                            self._mouse_down.discard(sig)
 
             self._kb_listener = keyboard.Listener(on_press=on_key_press, on_release=on_key_release)
             self._kb_listener.daemon = True
@@ -200,9 +258,12 @@ class IntervalMeter(QObject):
             self._target_sig = None
 
             self._last_ts = None
-            self.intervals.clear()
+            del self.intervals[:]
             self._count = 0
+            self._pending.clear()
+            self._keys_mask = 0
             self._keys_down.clear()
+            self._mouse_mask = 0
             self._mouse_down.clear()
 
         self.status.emit(
@@ -222,9 +283,11 @@ class IntervalMeter(QObject):
             return bool(self._enabled)
 
     # ---- core ----
-    def _handle_event(self, kind: str, sig: tuple, name: str):
-        ts = time.perf_counter()
-
+    def _handle_event(self, kind: str, sig: tuple, name: str, ts: int):
+        # ts — perf_counter_ns() снятый вызывающим до захвата lock;
+        # сигналы шлём только после выхода из lock.
+        status_msg: Optional[str] = None
+        arm_flush = False
         with self._lock:
             if not self._enabled:
                 return
@@ -237,30 +300,37 @@ class IntervalMeter(QObject):
 
                 # считаем это первым нажатием (от него пойдёт первый интервал)
                 self._last_ts = ts
-                chosen = name
-                # для клавы иногда nice показать имя
-                if kind == "key":
-                    chosen = name
-                self.status.emit(f"Замер: выбрано «{chosen}». Теперь нажимай ЕЁ же — считаю интервалы. F8 — стоп.")
-                return
+                status_msg = f"Замер: выбрано «{name}». Теперь нажимай ЕЁ же — считаю интервалы. F8 — стоп."
+            else:
+                # 2) Фильтр: считаем только выбранную кнопку
+                if kind != self._target_kind or sig != self._target_sig:
+                    return
 
-            # 2) Фильтр: считаем только выбранную кнопку
-            if kind != self._target_kind or sig != self._target_sig:
-                return
+                # 3) Интервал
+                if self._last_ts is None:
+                    self._last_ts = ts
+                    return
 
-            # 3) Интервал
-            if self._last_ts is None:
+                dt_ns = ts - self._last_ts
+                if dt_ns < self.MIN_INTERVAL_NS:
+                    # _last_ts не трогаем: следующий интервал считается от настоящего нажатия
+                    return
                 self._last_ts = ts
-                return
 
-            dt = ts - self._last_ts
-            self._last_ts = ts
-
-            self.intervals.append(dt)
-            self._count += 1
-            idx = self._count
-
-        # имя для таблицы — выбранная кнопка (фиксированная)
-        self.interval.emit(dt, name, idx)
+                self.intervals.append(dt_ns)
+                self._count += 1
+                # имя для таблицы — выбранная кнопка (фиксированная)
+                self._pending.append((dt_ns * 1e-9, name, self._count))
+                arm_flush = len(self._pending) == 1
 
+        if status_msg is not None:
+            self.status.emit(status_msg)
+        elif arm_flush:
+            self._flush_requested.emit()
 
+    def _flush_pending(self):
+        with self._lock:
+            batch = self._pending
+            self._pending = []
+        if batch:
+            self.interval_batch.emit(batch)
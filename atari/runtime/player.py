@@ -2,14 +2,21 @@
 # Main: MacroPlayer, PlayerSignals.
 # Example: from atari.runtime.player import MacroPlayer
 
+import functools
+import heapq
 import random
+import sys
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional, Tuple
 
 from PySide6.QtCore import QObject, QRect, QThread, Signal
 
-from atari.core.config import DEBUG_STOP_WORD_OCR, FOCUS_POLL_SEC, STOP_WORD_POLL_SEC
+from atari.core.config import (
+    DEBUG_STOP_WORD_OCR, FOCUS_POLL_SEC, STOP_WORD_POLL_BACKOFF, STOP_WORD_POLL_MAX_FACTOR, STOP_WORD_POLL_SEC,
+    WAIT_EVENT_POLL_BACKOFF, WAIT_EVENT_POLL_MAX_SEC, WINDOW_STATE_TTL_SEC,
+)
 from atari.core.geometry import rect_to_rel, rel_to_rect, virtual_geometry
 from atari.core.models import (
     Action, AreaAction, BaseAreaAction, Delay, KeyAction, MouseButtonName,
@@ -18,9 +25,267 @@ from atari.core.models import (
 )
 from atari.core.win32 import (
     _hwnd_int, _is_windows, _user32, _win_activate_hwnd, _win_client_rect_screen_dip,
-    _win_dpi_for_hwnd, _win_send_key_batch, _win_send_key_by_name, resolve_hwnd_by_exe,
+    _win_dpi_for_hwnd, _win_hwnd_alive, _win_pid_from_hwnd, _win_send_key_batch, _win_send_key_by_name,
+    resolve_hwnd_by_exe,
 )
 
+# ---- Key name -> pynput ----
+_MOD_ALIASES = {"ctrl": "Ctrl", "shift": "Shift", "alt": "Alt", "meta": "Meta"}
+_MOD_NAMES = frozenset(("Shift", "Ctrl", "Alt", "Meta"))
+# Порядок нажатия модификаторов; в сортировку попадают только имена из _MOD_NAMES.
+_MOD_ORDER = {"Ctrl": 0, "Alt": 1, "Shift": 2, "Meta": 3}
+_MOD_ORDER_KEY = _MOD_ORDER.__getitem__
+_SPECIAL_KEY_ATTRS = {
+    "Escape": "esc",
+    "Enter": "enter",
+    "Tab": "tab",
+    "Backspace": "backspace",
+    "Delete": "delete",
+    "Insert": "insert",
+    "Space": "space",
+    "Home": "home",
+    "End": "end",
+    "PageUp": "page_up",
+    "PageDown": "page_down",
+    "Up": "up",
+    "Down": "down",
+    "Left": "left",
+    "Right": "right",
+    "CapsLock": "caps_lock",
+    "PrintScreen": "print_screen",
+    "Pause": "pause",
+    "Ctrl": "ctrl",
+    "Shift": "shift",
+    "Alt": "alt",
+    "Meta": "cmd",
+}
+_PYNPUT_SPECIALS: Optional[Dict[str, Any]] = None
+
+
+def _pynput_specials() -> Dict[str, Any]:
+    """Special-key table, built on first use (pynput is imported lazily)."""
+    global _PYNPUT_SPECIALS
+    if _PYNPUT_SPECIALS is None:
+        from pynput.keyboard import Key
+
+        table = {name: getattr(Key, attr) for name, attr in _SPECIAL_KEY_ATTRS.items()}
+        # pynput supports Key.f1..f20 (platform dependent upper bound)
+        for i in range(1, 25):
+            fk = getattr(Key, f"f{i}", None)
+            if fk is not None:
+                table[f"F{i}"] = fk
+        _PYNPUT_SPECIALS = table
+    return _PYNPUT_SPECIALS
+
+
+# Callers pass a small fixed set of raw names, so the cache hit is the hot path:
+# strip/casefold/alias lookups run once per distinct spelling.
+@functools.lru_cache(maxsize=512)
+def k_to_pynput(name: str):
+    n = (name or "").strip()
+    n = _MOD_ALIASES.get(n.casefold(), n)
+    pk = _pynput_specials().get(n)
+    if pk is not None:
+        return pk
+    # letters/digits
+    if len(n) == 1:
+        # pynput wants lowercase for letters
+        if n.isalpha():
+            return n.lower()
+        return n
+    return None
+
+
+@functools.lru_cache(maxsize=128)
+def _mod_pynput_keys(keys: Tuple[str, ...]) -> Tuple[Any, ...]:
+    """pynput keys for the modifiers in a key list (original order, unmapped dropped)."""
+    return tuple(pk for pk in (k_to_pynput(k) for k in keys if k in _MOD_NAMES) if pk is not None)
+
+
+@functools.lru_cache(maxsize=256)
+def _combo_plan(keys: Tuple[str, ...]) -> Tuple[Tuple[str, ...], Tuple[str, ...], Optional[Tuple[Any, ...]]]:
+    """(downs, ups, pynput keys of downs or None if any is unmapped) for a key combo."""
+    mods = sorted((k for k in keys if k in _MOD_NAMES), key=_MOD_ORDER_KEY)
+    normals = [k for k in keys if k not in _MOD_NAMES]
+    # mods down -> normals down -> normals up -> mods up
+    downs = tuple(mods + normals)
+    pks = tuple(k_to_pynput(k) for k in downs)
+    return downs, downs[::-1], (pks if all(pk is not None for pk in pks) else None)
+
+
+def _rect_usable(r: Optional[QRect], min_side: int = 3) -> bool:
+    """Rect exists, is valid and both sides are >= min_side px (default: OCR hit / clickable area)."""
+    return r is not None and r.isValid() and r.width() >= min_side and r.height() >= min_side
+
+
+def _jitter_bounds(area: Optional[QRect]) -> Optional[Tuple[int, int, int, int]]:
+    """Half-open bounds (x0, x1, y0, y1) strictly inside area, or None if it is too small."""
+    if not _rect_usable(area):
+        return None
+    return area.left() + 1, area.right(), area.top() + 1, area.bottom()
+
+
+_WAIT_EVENT_MIN_GAP = 0.05  # WaitEvent: minimum pause between OCR probes
+_OCR_FRAME_TTL = 0.04       # < _WAIT_EVENT_MIN_GAP: only other actions probing the same frame share a result
+_PROGRESS_EMIT_SEC = 0.033  # progress signal at most ~30 Hz (completion always emitted)
+_RETRY_STATUS_SEC = 0.25    # "not found, retry" status: every 5th attempt or this often
+_AREA_STATUS_SEC = 0.033    # "Область: ..." status is formatted/emitted at most this often
+
+
+def _jitter_points(rng: random.Random, bounds: Tuple[int, int, int, int], n: int) -> List[Tuple[int, int]]:
+    """All n jitter targets of a repeat batch, drawn up front (bounds from _jitter_bounds)."""
+    x0, x1, y0, y1 = bounds
+    w, h = x1 - x0, y1 - y0
+    # rng.random() is a single C call; randrange() goes through several Python frames
+    rnd = rng.random
+    return [(x0 + int(rnd() * w), y0 + int(rnd() * h)) for _ in range(n)]
+
+# ---- Action preprocessing ----
+
+# Dispatch tags: one dict lookup by exact type instead of an isinstance chain per action.
+_K_BASE, _K_AREA, _K_WORD, _K_WAIT_EVENT, _K_WAIT, _K_KEY = range(6)
+_ACTION_KINDS: Dict[type, int] = {
+    BaseAreaAction: _K_BASE,
+    AreaAction: _K_AREA,
+    WordAreaAction: _K_WORD,
+    WaitEventAction: _K_WAIT_EVENT,
+    WaitAction: _K_WAIT,
+    KeyAction: _K_KEY,
+}
+
+
+def _action_kind(a: Any) -> int:
+    """Dispatch tag of an action; unknown types fall through to the KeyAction path, as before."""
+    return _ACTION_KINDS.get(type(a), _K_KEY)
+
+def _normalize_key_press_mode(mode: Any) -> str:
+    return "long" if str(mode or "").strip().lower() == "long" else "normal"
+
+
+def _normalize_delay_cfg(raw: Any, default_sec: float) -> Dict[str, Any]:
+    try:
+        if isinstance(raw, Delay):
+            d = raw
+        elif isinstance(raw, dict):
+            d = Delay.from_dict(raw)
+        else:
+            d = Delay("fixed", float(default_sec), float(default_sec))
+    except Exception:
+        d = Delay("fixed", float(default_sec), float(default_sec))
+
+    mode = "range" if str(getattr(d, "mode", "fixed")).lower() == "range" else "fixed"
+    try:
+        a = max(0.0, float(getattr(d, "a", default_sec)))
+    except Exception:
+        a = max(0.0, float(default_sec))
+    try:
+        b = max(0.0, float(getattr(d, "b", a)))
+    except Exception:
+        b = a
+    if mode == "fixed":
+        b = a
+    return {"mode": mode, "a": float(a), "b": float(b)}
+
+
+# Long-press activate modes; normalized items always hold these exact objects.
+_FROM_START = sys.intern("from_start")
+_AFTER_PREV = sys.intern("after_prev")
+
+
+def _normalize_long_press_item(raw: Any) -> Optional[Dict[str, Any]]:
+    if not isinstance(raw, dict):
+        return None
+
+    trigger_raw = raw.get("trigger")
+    hold_raw = raw.get("hold")
+    activate_mode_raw = raw.get("activate_mode", _AFTER_PREV)
+    start_delay_raw = raw.get("start_delay")
+
+    # Backward compatibility: legacy long entries stored regular KeyAction dicts.
+    if not isinstance(trigger_raw, dict):
+        try:
+            legacy_action = action_from_dict(raw)
+        except Exception:
+            legacy_action = None
+        if isinstance(legacy_action, KeyAction):
+            trigger_raw = {
+                "kind": legacy_action.kind,
+                "keys": list(getattr(legacy_action, "keys", []) or []),
+                "mouse_button": getattr(legacy_action, "mouse_button", None),
+            }
+            hold_raw = legacy_action.delay.to_dict()
+
+    if not isinstance(trigger_raw, dict):
+        return None
+
+    return {
+        "trigger": normalize_trigger(trigger_raw),
+        "hold": _normalize_delay_cfg(hold_raw, 0.2),
+        "activate_mode": _FROM_START if str(activate_mode_raw).strip().lower() == _FROM_START else _AFTER_PREV,
+        "start_delay": _normalize_delay_cfg(start_delay_raw, 0.0),
+    }
+
+
+def _key_long_action_items(a_key: KeyAction) -> List[Dict[str, Any]]:
+    cfg = a_key.long_press
+    if not isinstance(cfg, dict):
+        return []
+    raw = cfg.get("actions", [])
+    if not isinstance(raw, list):
+        return []
+    out: List[Dict[str, Any]] = []
+    for ad in raw:
+        item = _normalize_long_press_item(ad)
+        if item is not None:
+            out.append(item)
+    return out
+
+
+def _build_inline_action_seq(raw_actions: List[Dict[str, Any]]) -> List[Action]:
+    seq: List[Action] = []
+    for ad in (raw_actions or []):
+        if not isinstance(ad, dict):
+            continue
+        try:
+            seq.append(action_from_dict(ad))
+        except Exception:
+            continue
+    return seq
+
+
+def _estimate_action_progress_item(it: Action, depth: int = 0) -> int:
+    if depth >= 8:
+        return 0
+    if isinstance(it, KeyAction):
+        if _normalize_key_press_mode(it.press_mode) == "long":
+            return len(_key_long_action_items(it))
+        try:
+            mult = int(it.multiplier)
+        except Exception:
+            mult = 1
+        return max(1, mult)
+    if isinstance(it, (WaitAction, WaitEventAction)):
+        return 1
+    return 0
+
+
+def _estimate_extra_progress_items(seq_actions: List[Action]) -> int:
+    extra = 0
+    for it in seq_actions:
+        extra += _estimate_action_progress_item(it)
+    return extra
+
+
+
+_WORD_RETRY_DELAY = 0.12
+_WORD_ROUND_DELAY = 5.0
+
+
+def _word_search_cfg(a: WordAreaAction) -> Tuple[int, bool, str, float, float]:
+    # WordAreaAction.__post_init__ has already validated the search fields.
+    return a.search_max_tries, a.search_infinite, a.search_on_fail, _WORD_RETRY_DELAY, _WORD_ROUND_DELAY
+
+
 # ---- Playback Thread ----
 class PlayerSignals(QObject):
     status = Signal(str)
@@ -37,6 +302,11 @@ class PlayerSignals(QObject):
     finished = Signal()
 
 
+# Threading: run() executes on this QThread; the stop-word OCR worker is a plain
+# daemon thread. Tesseract and the Win32/pynput input calls release the GIL, so
+# the only Python-level contention with the UI is signal emission. The player is
+# not tied to a GIL build and needs no changes for free-threaded CPython, but
+# PySide6 itself does not ship free-threaded wheels, so nothing is gated on it.
 class MacroPlayer(QThread):
     def __init__(self, record: Record, bound_exe: str = "", stop_word_cfg: Optional[dict] = None,
                  stop_word_enabled_event: Optional[threading.Event] = None, start_index: int = 0):
@@ -47,7 +317,12 @@ class MacroPlayer(QThread):
         self._stop = threading.Event()
         self._pause = threading.Event()
         self._pause.set()
-        self._pause_lock = threading.Lock()
+        # Set on stop/pause so timed waits in the player wake immediately.
+        self._wake = threading.Event()
+        # Last resolved window of the bound exe (re-resolved only once it dies).
+        self._cached_hwnd = 0
+        self._cached_pid = 0
+        self._window_state: Optional[Tuple[float, Tuple[int, Optional[QRect], float, bool]]] = None
         self.end_state = "done"  # done | stopped | error
         self.end_reason = ""
 
@@ -62,13 +337,32 @@ class MacroPlayer(QThread):
             if interval <= 0:
                 interval = float(STOP_WORD_POLL_SEC)
             self._stop_word_interval = interval
+        # Adaptive stop-word polling: back off while the word is absent and the
+        # base is unchanged, snap back to the configured interval otherwise.
+        self._sw_min_interval = self._stop_word_interval
+        self._sw_max_interval = self._stop_word_interval * max(1.0, float(STOP_WORD_POLL_MAX_FACTOR))
+        self._sw_current_interval = self._sw_min_interval
+        self._sw_backoff = max(1.0, float(STOP_WORD_POLL_BACKOFF))
         self._stop_word_enabled_event = stop_word_enabled_event
+        self._ocr_available = is_ocr_available(force_refresh=False)
+        # Собственный генератор: без общей блокировки модульного random.
+        self._rng = random.Random()
         self._start_index = max(0, int(start_index))
+        # Разбор действий один раз: run() берёт готовые объекты и long-press спеки.
+        self._actions: Optional[List[Action]] = None
+        self._kinds: List[int] = []
+        self._long_specs: Dict[int, List[Dict[str, Any]]] = {}
+        self._total = 1
+        self._has_ocr_actions = False
+        self._ocr_pool: Optional[ThreadPoolExecutor] = None
+        self._frame_cache: Dict[tuple, Tuple[float, int, Optional[QRect]]] = {}
+        self._display_cache: Dict[int, Tuple[Action, str]] = {}
+        self._inline_seq_cache: Dict[int, Tuple[List[Dict[str, Any]], List[Action]]] = {}
+        self._prepare_actions()
 
         # NEW: stop-word worker (С‡С‚РѕР±С‹ OCR РЅРµ РґС‘СЂРіР°Р» РѕСЃРЅРѕРІРЅРѕР№ РїРѕС‚РѕРє)
-        self._sw_lock = threading.Lock()
-        self._sw_base: Optional[QRect] = None
-        self._sw_dpr: float = 1.0
+        # ((left, top, width, height), dpr): заменяется целиком — читается без замка.
+        self._sw_snapshot: Optional[Tuple[Tuple[int, int, int, int], float]] = None
         self._sw_thread: Optional[threading.Thread] = None
 
 
@@ -81,24 +375,156 @@ class MacroPlayer(QThread):
         self._mark_end("stopped", reason)
         self._stop.set()
         self._pause.set()  # С‡С‚РѕР±С‹ РЅРµ Р·Р°РІРёСЃ РІ РїР°СѓР·Рµ
+        self._wake.set()
 
+    # Без отдельного замка: Event сам синхронизирован, сигнал шлём только на
+    # наблюдаемом переходе. Гонка двух одновременных pause() даст лишь повторный
+    # paused(True) — безвредно.
     def pause(self, reason: str = "Пауза"):
-        with self._pause_lock:
-            if not self._pause.is_set():
-                return
-            self._pause.clear()
+        if not self._pause.is_set():
+            return
+        self._pause.clear()
+        self._wake.set()
         self.signals.paused.emit(True, reason)
 
     def resume(self):
-        with self._pause_lock:
-            if self._pause.is_set():
-                return
-            self._pause.set()
+        if self._pause.is_set():
+            return
+        self._pause.set()
         self.signals.paused.emit(False, "")
 
     def is_paused(self) -> bool:
         return not self._pause.is_set()
 
+    def refresh_ocr(self, force_refresh: bool = True) -> bool:
+        """Re-probe Tesseract (e.g. after it was installed while the app runs)."""
+        self._ocr_available = is_ocr_available(force_refresh=force_refresh)
+        return self._ocr_available
+
+    def _bound_hwnd(self) -> int:
+        # Перебор окон процесса только когда закэшированное окно умерло/свернулось.
+        hwnd = self._cached_hwnd
+        if hwnd and _win_hwnd_alive(hwnd, self._cached_pid):
+            return hwnd
+        hwnd = resolve_hwnd_by_exe(self._bound_exe)
+        self._cached_hwnd = hwnd
+        self._cached_pid = _win_pid_from_hwnd(hwnd) if hwnd else 0
+        return hwnd
+
+    def _poll_window_state(self) -> Tuple[int, Optional[QRect], float, bool]:
+        """(hwnd, rect_dip, dpr, is_foreground) of the bound window in one pass."""
+        now = time.perf_counter()
+        hwnd = self._bound_hwnd()
+        if not hwnd:
+            state = (0, None, 1.0, False)
+        else:
+            rect = _win_client_rect_screen_dip(hwnd)
+            dpr = float(_win_dpi_for_hwnd(hwnd)) / 96.0
+            if dpr <= 0:
+                dpr = 1.0
+            fg = _hwnd_int(_user32.GetForegroundWindow())
+            state = (hwnd, rect, dpr, fg == hwnd)
+        self._window_state = (now, state)
+        return state
+
+    def _window_state_recent(self, now: float) -> Tuple[int, Optional[QRect], float, bool]:
+        # Focus poll and base resolve usually run back-to-back: share one Win32 pass.
+        ws = self._window_state
+        if ws is not None and now - ws[0] <= float(WINDOW_STATE_TTL_SEC):
+            return ws[1]
+        return self._poll_window_state()
+
+    def _ocr_resolve(self, action: WaitEventAction, base: Optional[QRect], dpr: float) -> Optional[QRect]:
+        """OCR lookup on the pool; gives up (None) as soon as the player is stopped.
+
+        Identical probes (same area, text, language, base and dpr) of *different* actions
+        started within _OCR_FRAME_TTL share one capture + OCR pass; an action re-probing
+        always reads the screen again.
+        """
+        key = (
+            action.coord, action.x1, action.y1, action.x2, action.y2,
+            action.rx1, action.ry1, action.rx2, action.ry2,
+            action.expected_text, action.ocr_lang,
+            (base.left(), base.top(), base.width(), base.height()) if base is not None else None,
+            float(dpr),
+        )
+        started = time.perf_counter()
+        hit = self._frame_cache.get(key)
+        if hit is not None and hit[1] != id(action) and started - hit[0] <= _OCR_FRAME_TTL:
+            return QRect(hit[2]) if hit[2] is not None else None
+
+        found = self._ocr_call(action.resolve_target_rect_global, base, dpr)
+        if not self._stop.is_set():
+            if len(self._frame_cache) >= 64:
+                self._frame_cache.clear()
+            # stamped with the probe start: the result shows the screen as of then
+            self._frame_cache[key] = (started, id(action), QRect(found) if found is not None else None)
+        return found
+
+    def _ocr_call(self, resolve, base: Optional[QRect], dpr: float) -> Optional[QRect]:
+        """Run resolve(base, dpr_override=dpr) on the OCR pool; None if stopped meanwhile."""
+        pool = self._ocr_pool
+        if pool is None:
+            pool = self._ocr_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="atari-ocr")
+        fut = pool.submit(resolve, base, dpr_override=dpr)
+        wake = self._wake
+        fut.add_done_callback(lambda _f: wake.set())
+        while True:
+            wake.clear()
+            if fut.done():
+                return fut.result()
+            if self._stop.is_set():
+                fut.cancel()
+                return None
+            wake.wait()
+
+    def _display_for(self, a: Action) -> str:
+        """action_to_display(a)[1], formatted once per action object.
+
+        Actions are materialized per player, so an edited record never hits a stale entry.
+        """
+        hit = self._display_cache.get(id(a))
+        if hit is not None and hit[0] is a:
+            return hit[1]
+        text = action_to_display(a)[1]
+        cache = self._display_cache
+        if len(cache) >= 512:
+            cache.clear()
+        cache[id(a)] = (a, text)
+        return text
+
+    def _inline_seq(self, raw_actions: List[Dict[str, Any]]) -> List[Action]:
+        """Built on-fail/inline action list, reused across cycles for the same raw list."""
+        hit = self._inline_seq_cache.get(id(raw_actions))
+        if hit is not None and hit[0] is raw_actions:
+            return hit[1]
+        seq = _build_inline_action_seq(raw_actions)
+        self._inline_seq_cache[id(raw_actions)] = (raw_actions, seq)
+        return seq
+
+    def _prepare_actions(self, strict: bool = False) -> bool:
+        """Materialize record actions, long-press specs and the progress total."""
+        try:
+            actions: List[Action] = []
+            for ad in self.record.actions:
+                if isinstance(ad, dict):
+                    actions.append(action_from_dict(ad))
+        except Exception:
+            if strict:
+                raise
+            self._actions = None
+            return False
+        long_specs: Dict[int, List[Dict[str, Any]]] = {}
+        for a in actions:
+            if isinstance(a, KeyAction) and _normalize_key_press_mode(a.press_mode) == "long":
+                long_specs[id(a)] = _key_long_action_items(a)
+        self._actions = actions
+        self._kinds = [_action_kind(a) for a in actions]
+        self._long_specs = long_specs
+        self._has_ocr_actions = any(isinstance(a, (WordAreaAction, WaitEventAction)) for a in actions)
+        self._total = max(1, _estimate_extra_progress_items(actions))
+        return True
+
     def run(self):
 
         try:
@@ -112,56 +538,73 @@ class MacroPlayer(QThread):
                 return
 
             mouse = MouseController()
+            button_map = {"left": Button.left, "middle": Button.middle, "right": Button.right}
+            rng = self._rng
             kb = KeyboardController()
 
             base_area: Optional[QRect] = None
             last_base: Optional[QRect] = None
-            ocr_available = is_ocr_available(force_refresh=False)
 
             def _sw_set_snapshot(base: Optional[QRect], dpr: float):
-                with self._sw_lock:
-                    self._sw_base = QRect(base) if (base and base.isValid()) else None
-                    self._sw_dpr = float(dpr) if (dpr and dpr > 0) else 1.0
+                if base and base.isValid():
+                    self._sw_snapshot = (
+                        (base.left(), base.top(), base.width(), base.height()),
+                        float(dpr) if (dpr and dpr > 0) else 1.0,
+                    )
+                else:
+                    self._sw_snapshot = None
 
             def _start_stopword_worker():
-                if (not self._stop_word) or (not ocr_available):
+                if (not self._stop_word) or (not self._ocr_available):
                     return
 
                 def worker():
                     next_check = 0.0
+                    last_base: Optional[Tuple[int, int, int, int]] = None
+                    enabled_event = self._stop_word_enabled_event
                     while not self._stop.is_set():
-                        # enabled?
-                        if self._stop_word_enabled_event is not None and not self._stop_word_enabled_event.is_set():
-                            time.sleep(0.05)
+                        # enabled? (ждём включения; stop перепроверяется циклом)
+                        if enabled_event is not None and not enabled_event.is_set():
+                            enabled_event.wait(0.25)
                             continue
 
                         now = time.perf_counter()
                         if now < next_check:
-                            time.sleep(0.05)
+                            if self._stop.wait(next_check - now):
+                                break
                             continue
-                        next_check = now + float(self._stop_word_interval)
 
-                        with self._sw_lock:
-                            b = QRect(self._sw_base) if self._sw_base else None
-                            dpr = float(self._sw_dpr)
+                        snap = self._sw_snapshot
+                        if snap is not None:
+                            geom, dpr = snap
+                        else:
+                            geom, dpr = None, 1.0
+
+                        if geom != last_base:
+                            self._sw_current_interval = self._sw_min_interval
+                            last_base = geom
+                        next_check = now + self._sw_current_interval
 
-                        if b and b.isValid():
+                        if geom is not None and geom[2] > 0 and geom[3] > 0:
+                            b = QRect(*geom)
                             found = self._stop_word.resolve_target_rect_global(
                                 b,
                                 debug=bool(DEBUG_STOP_WORD_OCR),
                                 debug_tag="[STOP_WORD] ",
                                 dpr_override=dpr,  # NEW
                             )
-                            ok = bool(found and found.isValid() and found.width() > 2 and found.height() > 2)
+                            ok = _rect_usable(found)
                             if ok:
                                 w = getattr(self._stop_word, "word", "")
                                 self._mark_end("stopped", f"Остановлено: найдено стоп-слово '{w}'")
                                 self.signals.status.emit(f"Стоп-слово найдено: '{w}' — остановка.")
                                 self._stop.set()
                                 self._pause.set()
+                                self._wake.set()
                                 break
-
-                        time.sleep(0.05)
+                            self._sw_current_interval = min(
+                                self._sw_max_interval, self._sw_current_interval * self._sw_backoff
+                            )
 
                 self._sw_thread = threading.Thread(target=worker, daemon=True)
                 self._sw_thread.start()
@@ -179,24 +622,20 @@ class MacroPlayer(QThread):
                     return
                 next_focus_check = now + float(FOCUS_POLL_SEC)
 
-                hwnd = resolve_hwnd_by_exe(self._bound_exe)
+                hwnd, _rect, _dpr, is_fg = self._window_state_recent(now)
                 if not hwnd:
                     return
 
-                fg = _hwnd_int(_user32.GetForegroundWindow())
-                if force or fg != hwnd:
+                if force or not is_fg:
                     _win_activate_hwnd(hwnd)
+                    self._window_state = None  # фокус сменился — следующий опрос заново
 
             def _resolve_runtime_base() -> tuple[Optional[QRect], float, int]:
                 """(rect_dip, dpr, hwnd)"""
                 if self._bound_exe and _is_windows():
-                    hwnd = resolve_hwnd_by_exe(self._bound_exe)
+                    hwnd, rect, dpr, _is_fg = self._window_state_recent(time.perf_counter())
                     if not hwnd:
                         return None, 1.0, 0
-                    rect = _win_client_rect_screen_dip(hwnd)
-                    dpr = float(_win_dpi_for_hwnd(hwnd)) / 96.0
-                    if dpr <= 0:
-                        dpr = 1.0
                     return rect, dpr, hwnd
                 # fallback
                 return None, 1.0, 0
@@ -236,21 +675,14 @@ class MacroPlayer(QThread):
                     return rb_rect, current_area_ref
                 return last_base, current_area_ref
 
-            # NEW: С„РѕРєСѓСЃ + СЃРЅР°РїС€РѕС‚
-            _ensure_focus()
-            _sw_set_snapshot(base_area, current_dpr)
+            # action objects are prepared in __init__; rebuild here only if that failed
+            if self._actions is None:
+                self._prepare_actions(strict=True)
+            actions = self._actions
+            kinds = self._kinds
 
-            # build action objects
-            actions: List[Action] = []
-            for ad in self.record.actions:
-                if isinstance(ad, dict):
-                    actions.append(action_from_dict(ad))
-
-            has_ocr_actions = bool(self._stop_word) or any(
-                isinstance(a, (WordAreaAction, WaitEventAction))
-                for a in actions
-            )
-            if (not ocr_available) and has_ocr_actions:
+            has_ocr_actions = bool(self._stop_word) or self._has_ocr_actions
+            if (not self._ocr_available) and has_ocr_actions:
                 self.signals.status.emit(
                     "OCR недоступен: Tesseract не найден. OCR-действия будут пропущены."
                 )
@@ -259,33 +691,6 @@ class MacroPlayer(QThread):
             if start_index < 0 or start_index >= len(actions):
                 start_index = 0
 
-            def _normalize_key_press_mode(mode: Any) -> str:
-                return "long" if str(mode or "").strip().lower() == "long" else "normal"
-
-            def _normalize_delay_cfg(raw: Any, default_sec: float) -> Dict[str, Any]:
-                try:
-                    if isinstance(raw, Delay):
-                        d = raw
-                    elif isinstance(raw, dict):
-                        d = Delay.from_dict(raw)
-                    else:
-                        d = Delay("fixed", float(default_sec), float(default_sec))
-                except Exception:
-                    d = Delay("fixed", float(default_sec), float(default_sec))
-
-                mode = "range" if str(getattr(d, "mode", "fixed")).lower() == "range" else "fixed"
-                try:
-                    a = max(0.0, float(getattr(d, "a", default_sec)))
-                except Exception:
-                    a = max(0.0, float(default_sec))
-                try:
-                    b = max(0.0, float(getattr(d, "b", a)))
-                except Exception:
-                    b = a
-                if mode == "fixed":
-                    b = a
-                return {"mode": mode, "a": float(a), "b": float(b)}
-
             def _sample_delay_cfg(raw: Any, default_sec: float) -> float:
                 cfg = _normalize_delay_cfg(raw, default_sec)
                 a = float(cfg.get("a", default_sec))
@@ -293,146 +698,64 @@ class MacroPlayer(QThread):
                 if cfg.get("mode") == "range":
                     lo = min(a, b)
                     hi = max(a, b)
-                    return random.uniform(lo, hi)
+                    return rng.uniform(lo, hi)
                 return a
 
-            def _normalize_long_press_item(raw: Any) -> Optional[Dict[str, Any]]:
-                if not isinstance(raw, dict):
-                    return None
+            long_specs = self._long_specs
 
-                trigger_raw = raw.get("trigger")
-                hold_raw = raw.get("hold")
-                activate_mode_raw = raw.get("activate_mode", "after_prev")
-                start_delay_raw = raw.get("start_delay")
+            def _long_items_for(a_key: KeyAction) -> List[Dict[str, Any]]:
+                items = long_specs.get(id(a_key))
+                if items is None:
+                    items = _key_long_action_items(a_key)
+                return items
 
-                # Backward compatibility: legacy long entries stored regular KeyAction dicts.
-                if not isinstance(trigger_raw, dict):
-                    try:
-                        legacy_action = action_from_dict(raw)
-                    except Exception:
-                        legacy_action = None
-                    if isinstance(legacy_action, KeyAction):
-                        trigger_raw = {
-                            "kind": legacy_action.kind,
-                            "keys": list(getattr(legacy_action, "keys", []) or []),
-                            "mouse_button": getattr(legacy_action, "mouse_button", None),
-                        }
-                        hold_raw = legacy_action.delay.to_dict()
-
-                if not isinstance(trigger_raw, dict):
-                    return None
-
-                return {
-                    "trigger": normalize_trigger(trigger_raw),
-                    "hold": _normalize_delay_cfg(hold_raw, 0.2),
-                    "activate_mode": "from_start" if str(activate_mode_raw).strip().lower() == "from_start" else "after_prev",
-                    "start_delay": _normalize_delay_cfg(start_delay_raw, 0.0),
-                }
-
-            def _key_long_action_items(a_key: KeyAction) -> List[Dict[str, Any]]:
-                cfg = getattr(a_key, "long_press", {})
-                if not isinstance(cfg, dict):
-                    return []
-                raw = cfg.get("actions", [])
-                if not isinstance(raw, list):
-                    return []
-                out: List[Dict[str, Any]] = []
-                for ad in raw:
-                    item = _normalize_long_press_item(ad)
-                    if item is not None:
-                        out.append(item)
-                return out
-
-            def _build_inline_action_seq(raw_actions: List[Dict[str, Any]]) -> List[Action]:
-                seq: List[Action] = []
-                for ad in (raw_actions or []):
-                    if not isinstance(ad, dict):
-                        continue
-                    try:
-                        seq.append(action_from_dict(ad))
-                    except Exception:
-                        continue
-                return seq
+            total = self._total
 
-            def _estimate_action_progress_item(it: Action, depth: int = 0) -> int:
-                if depth >= 8:
-                    return 0
-                if isinstance(it, KeyAction):
-                    mode = _normalize_key_press_mode(getattr(it, "press_mode", "normal"))
-                    if mode == "long":
-                        return len(_key_long_action_items(it))
-                    try:
-                        mult = int(getattr(it, "multiplier", 1))
-                    except Exception:
-                        mult = 1
-                    return max(1, mult)
-                if isinstance(it, (WaitAction, WaitEventAction)):
-                    return 1
-                return 0
-
-            def _estimate_extra_progress_items(seq_actions: List[Action]) -> int:
-                extra = 0
-                for it in seq_actions:
-                    extra += _estimate_action_progress_item(it)
-                return extra
-
-            total = max(1, _estimate_extra_progress_items(actions))
-
-            def k_to_pynput(name: str):
-                n = (name or "").strip()
-                low = n.casefold()
-                if low == "ctrl":
-                    n = "Ctrl"
-                elif low == "shift":
-                    n = "Shift"
-                elif low == "alt":
-                    n = "Alt"
-                elif low == "meta":
-                    n = "Meta"
-
-                name_norm = n  # <-- РІР°Р¶РЅРѕ!
-
-                specials = {
-                    "Escape": Key.esc,
-                    "Enter": Key.enter,
-                    "Tab": Key.tab,
-                    "Backspace": Key.backspace,
-                    "Delete": Key.delete,
-                    "Insert": Key.insert,
-                    "Space": Key.space,
-                    "Home": Key.home,
-                    "End": Key.end,
-                    "PageUp": Key.page_up,
-                    "PageDown": Key.page_down,
-                    "Up": Key.up,
-                    "Down": Key.down,
-                    "Left": Key.left,
-                    "Right": Key.right,
-                    "CapsLock": Key.caps_lock,
-                    "PrintScreen": Key.print_screen,
-                    "Pause": Key.pause,
-                    "Ctrl": Key.ctrl,
-                    "Shift": Key.shift,
-                    "Alt": Key.alt,
-                    "Meta": Key.cmd,
-                }
-                if name_norm in specials:
-                    return specials[name_norm]
-                if name_norm.startswith("F") and name_norm[1:].isdigit():
-                    n = int(name_norm[1:])
-                    # pynput supports Key.f1..f20
-                    attr = f"f{n}"
-                    return getattr(Key, attr, None)
-                # letters/digits
-                if len(name_norm) == 1:
-                    # pynput wants lowercase for letters
-                    if name_norm.isalpha():
-                        return name_norm.lower()
-                    return name_norm
-                return None
+            # Progress/retry/area status are coalesced: the UI does not need more than ~30 Hz.
+            last_progress_at = 0.0
+            progress_pending = False
+            progress_emit = self.signals.progress.emit
+            last_retry_status_at = 0.0
+            last_area_status_at = 0.0
+
+            def _emit_progress():
+                nonlocal last_progress_at, progress_pending
+                now = time.perf_counter()
+                if done >= total or now - last_progress_at >= _PROGRESS_EMIT_SEC:
+                    last_progress_at = now
+                    progress_pending = False
+                    progress_emit(done, total)
+                else:
+                    progress_pending = True
+
+            def _flush_progress():
+                nonlocal last_progress_at, progress_pending
+                if progress_pending:
+                    last_progress_at = time.perf_counter()
+                    progress_pending = False
+                    progress_emit(done, total)
+
+            def _retry_status_due(attempt: int) -> bool:
+                nonlocal last_retry_status_at
+                now = time.perf_counter()
+                if attempt <= 1 or attempt % 5 == 0 or now - last_retry_status_at >= _RETRY_STATUS_SEC:
+                    last_retry_status_at = now
+                    return True
+                return False
+
+            def _area_status_due() -> bool:
+                # a skipped area line is superseded by the next action's own status
+                nonlocal last_area_status_at
+                now = time.perf_counter()
+                if now - last_area_status_at >= _AREA_STATUS_SEC:
+                    last_area_status_at = now
+                    return True
+                return False
 
             def perform_trigger(spec: dict):
-                spec = normalize_trigger(spec)
+                _perform_normalized_trigger(normalize_trigger(spec))
+
+            def _perform_normalized_trigger(spec: dict):
                 kind = spec["kind"]
                 keys = list(spec.get("keys") or [])
                 mb = spec.get("mouse_button")
@@ -441,13 +764,11 @@ class MacroPlayer(QThread):
                     if mb not in ("left", "middle", "right"):
                         mb = "left"
 
-                    mods_only = [k for k in keys if k in ("Shift", "Ctrl", "Alt", "Meta")]
+                    mods_only = [k for k in keys if k in _MOD_NAMES]
 
+                    # modifiers go down back-to-back; one settle wait before the click
                     for mname in mods_only:
-                        if self._stop.is_set():
-                            return
                         _kbd_down(mname)
-                        _sleep_checked(0.005)
 
                     _sleep_checked(0.020)
                     if not self._stop.is_set():
@@ -466,18 +787,25 @@ class MacroPlayer(QThread):
 
             def perform_trigger_times(spec: dict, times: int, delay: Optional[Delay] = None):
                 reps = max(1, int(times))
-                for i in range(reps):
+                spec = normalize_trigger(spec)
+                if delay is None:
+                    # Частый случай "нажать N раз": стоп проверяет _sleep_checked между повторами.
                     if self._stop.is_set():
                         return
-                    if delay is not None:
-                        t = delay.sample()
-                        if t > 0:
-                            if not _sleep_checked(t):
-                                return
-                    perform_trigger(spec)
-                    if delay is None and i + 1 < reps:
-                        if not _sleep_checked(0.03):
+                    last = reps - 1
+                    for i in range(reps):
+                        _perform_normalized_trigger(spec)
+                        if i < last and not _sleep_checked(0.03):
                             return
+                    return
+                for _ in range(reps):
+                    if self._stop.is_set():
+                        return
+                    t = delay.sample(rng)
+                    if t > 0:
+                        if not _sleep_checked(t):
+                            return
+                    _perform_normalized_trigger(spec)
 
             def _press_hold_trigger(spec: dict) -> Dict[str, Any]:
                 spec = normalize_trigger(spec)
@@ -485,14 +813,11 @@ class MacroPlayer(QThread):
                 keys = list(spec.get("keys") or [])
                 mb = spec.get("mouse_button")
 
-                mod_names = {"Shift", "Ctrl", "Alt", "Meta"}
-                mod_order = {"Ctrl": 0, "Alt": 1, "Shift": 2, "Meta": 3}
-
                 if kind == "mouse":
                     if mb not in ("left", "middle", "right"):
                         mb = "left"
-                    mods_only = [k for k in keys if k in mod_names]
-                    mods_only.sort(key=lambda x: mod_order.get(x, 99))
+                    mods_only = [k for k in keys if k in _MOD_NAMES]
+                    mods_only.sort(key=_MOD_ORDER_KEY)
 
                     for mname in mods_only:
                         if self._stop.is_set():
@@ -500,12 +825,7 @@ class MacroPlayer(QThread):
                         _kbd_down(mname)
                         _sleep_checked(0.001)
 
-                    if mb == "left":
-                        btn = Button.left
-                    elif mb == "middle":
-                        btn = Button.middle
-                    else:
-                        btn = Button.right
+                    btn = button_map.get(mb, Button.right)
 
                     _ensure_focus()
                     try:
@@ -518,9 +838,9 @@ class MacroPlayer(QThread):
                 if not keys:
                     return {"kind": "noop"}
 
-                mods = [k for k in keys if k in mod_names]
-                normals = [k for k in keys if k not in mod_names]
-                mods.sort(key=lambda x: mod_order.get(x, 99))
+                mods = [k for k in keys if k in _MOD_NAMES]
+                normals = [k for k in keys if k not in _MOD_NAMES]
+                mods.sort(key=_MOD_ORDER_KEY)
                 downs = mods + normals
                 ups = list(reversed(normals)) + list(reversed(mods))
 
@@ -578,11 +898,14 @@ class MacroPlayer(QThread):
                             except Exception:
                                 pass
 
-            def smooth_move_to(x: int, y: int, duration: float):
+            def smooth_move_to(x: int, y: int, duration: float) -> bool:
+                """Ease the cursor to (x, y) over duration; False if stopped on the way."""
                 duration = max(0.0, float(duration))
                 if duration <= 0.001:
+                    if self._stop.is_set():
+                        return False
                     mouse.position = (x, y)
-                    return
+                    return True
                 start = mouse.position
                 sx, sy = start[0], start[1]
                 dx = x - sx
@@ -590,53 +913,64 @@ class MacroPlayer(QThread):
                 steps = max(1, int(duration * 120))
                 step_sleep = duration / steps
 
+                # Путь считаем заранее: в цикле остаётся только запись позиции и сон.
+                path = []
                 for i in range(1, steps + 1):
-                    if self._stop.is_set():
-                        return
-                    if not _wait_if_paused():
-                        return
-
                     t = i / steps
                     tt = t * t * (3 - 2 * t)  # ease in-out
-                    nx = int(sx + dx * tt)
-                    ny = int(sy + dy * tt)
-                    mouse.position = (nx, ny)
+                    path.append((int(sx + dx * tt), int(sy + dy * tt)))
 
+                for pos in path:
+                    if self._stop.is_set():
+                        return False
+                    if not _wait_if_paused():
+                        return False
+                    mouse.position = pos
                     if not _sleep_checked(step_sleep):
-                        return
+                        return False
+                return True
 
             def click(btn_name: MouseButtonName):
-                if btn_name == "left":
-                    b = Button.left
-                elif btn_name == "middle":
-                    b = Button.middle
-                else:
-                    b = Button.right
+                b = button_map.get(btn_name, Button.right)
                 mouse.press(b)
                 _sleep_checked(0.01)
                 mouse.release(b)
 
             def _wait_if_paused() -> bool:
-                while not self._stop.is_set() and not self._pause.is_set():
-                    time.sleep(0.05)
+                # stop() also sets _pause, so this never blocks past a stop.
+                if not self._pause.is_set():
+                    self._pause.wait()
                 return not self._stop.is_set()
 
             def _sleep_checked(sec: float) -> bool:
                 """Sleep РєСѓСЃРєР°РјРё, СѓС‡РёС‚С‹РІР°СЏ stop() Рё PAUSE (РІРѕ РІСЂРµРјСЏ РїР°СѓР·С‹ РІСЂРµРјСЏ РЅРµ "СЃСЉРµРґР°РµС‚СЃСЏ")."""
+                if progress_pending:
+                    _flush_progress()
                 remaining = max(0.0, float(sec))
                 while remaining > 0:
-                    if self._stop.is_set():
-                        return False
                     if not _wait_if_paused():
                         return False
 
-                    chunk = min(0.01, remaining)
+                    # _wake is set by stop()/pause(); re-check after clearing so a
+                    # transition that raced the clear is not lost.
+                    self._wake.clear()
+                    if self._stop.is_set() or not self._pause.is_set():
+                        continue
                     t0 = time.perf_counter()
 
-                    time.sleep(chunk)
+                    self._wake.wait(remaining)
                     remaining -= (time.perf_counter() - t0)
                 return True
 
+            def _wait_stop(sec: float) -> bool:
+                """OCR retry/poll pause: one Event.wait, False if stopped.
+
+                Pause is honoured by the caller's loop before the next OCR pass.
+                """
+                if progress_pending:
+                    _flush_progress()
+                return not self._stop.wait(sec)
+
             def _kbd_down(name: str) -> bool:
                 if _is_windows():
                     if _win_send_key_by_name(name, True):
@@ -658,19 +992,12 @@ class MacroPlayer(QThread):
                 return False
 
             def press_combo(keys: List[str]):
-                _ensure_focus()
+                press_combo_plan(_combo_plan(tuple(keys)))
 
-                mod_names = {"Shift", "Ctrl", "Alt", "Meta"}
-                mod_order = {"Ctrl": 0, "Alt": 1, "Shift": 2, "Meta": 3}
-
-                mods = [k for k in keys if k in mod_names]
-                normals = [k for k in keys if k not in mod_names]
-
-                mods.sort(key=lambda x: mod_order.get(x, 99))
+            def press_combo_plan(plan: Tuple[Tuple[str, ...], Tuple[str, ...], Optional[Tuple[Any, ...]]]):
+                _ensure_focus()
 
-                # С…РѕС‚РёРј: mods down -> normals down -> normals up -> mods up
-                downs = mods + normals
-                ups = list(reversed(normals)) + list(reversed(mods))
+                downs, ups, pks = plan
 
                 KEY_HOLD_TIME = 0.060  # <--- РµСЃР»Рё РёРіСЂР° РєР°РїСЂРёР·РЅР°СЏ, РјРѕР¶РЅРѕ 0.08-0.12
                 AFTER_UP_DELAY = 0.005
@@ -710,26 +1037,61 @@ class MacroPlayer(QThread):
                     return
 
                 # РЅРµ-Windows fallback
-                for k in downs:
-                    _kbd_down(k)
-                    _sleep_checked(0.001)
+                if pks is not None:
+                    # pynput сам жмёт пачкой и отпускает в обратном порядке (= ups)
+                    with kb.pressed(*pks):
+                        held = _sleep_checked(KEY_HOLD_TIME)
+                    if held:
+                        _sleep_checked(AFTER_UP_DELAY)
+                    return
 
-                if not _sleep_checked(KEY_HOLD_TIME):
-                    for k in ups:
+                # отпускаем только реально нажатые, в обратном порядке, даже при исключении
+                held_keys: List[str] = []
+                held = False
+                try:
+                    for k in downs:
+                        if _kbd_down(k):
+                            held_keys.append(k)
+                        _sleep_checked(0.001)
+                    held = _sleep_checked(KEY_HOLD_TIME)
+                finally:
+                    for k in reversed(held_keys):
                         try:
                             _kbd_up(k)
                         except Exception:
                             pass
-                    return
+                        if held:
+                            _sleep_checked(0.001)
 
-                for k in ups:
-                    try:
-                        _kbd_up(k)
-                        _sleep_checked(0.001)
-                    except Exception:
-                        pass
+                if held:
+                    _sleep_checked(AFTER_UP_DELAY)
+
+            def _key_once(a_key: KeyAction):
+                """One repetition of a KeyAction, specialized once per batch (no per-click branching)."""
+                mouse_button = a_key.mouse_button if a_key.kind == "mouse" else None
+                if not mouse_button:
+                    plan = _combo_plan(tuple(a_key.keys))
+
+                    def _keys_only():
+                        press_combo_plan(plan)
+                    return _keys_only
 
-                _sleep_checked(AFTER_UP_DELAY)
+                mod_pks = _mod_pynput_keys(tuple(a_key.keys))
+                stop_is_set = self._stop.is_set
+                if not mod_pks:
+                    def _mouse_plain():
+                        _sleep_checked(0.020)
+                        if not stop_is_set():
+                            click(mouse_button)
+                    return _mouse_plain
+
+                def _mouse_with_mods():
+                    # pynput отпускает моды в обратном порядке, даже если клик упал
+                    with kb.pressed(*mod_pks):
+                        _sleep_checked(0.020)  # РґР°С‚СЊ РёРіСЂРµ СѓРІРёРґРµС‚СЊ РјРѕРґС‹
+                        if not stop_is_set():
+                            click(mouse_button)
+                return _mouse_with_mods
 
             current_area: Optional[QRect] = base_area
             move_mouse_ready = bool(getattr(self.record, "move_mouse", True))
@@ -794,93 +1156,221 @@ class MacroPlayer(QThread):
                     self.signals.current.emit("Список действий для продолжительного нажатия пуст.")
                     return True
 
-                plan: List[Dict[str, Any]] = []
+                # Plan as parallel lists (index = item index): no per-item dicts.
+                triggers: List[Dict[str, Any]] = []
+                start_secs: List[float] = []
+                end_secs: List[float] = []
+                hold_secs: List[float] = []
                 prev_end = 0.0
 
                 # Build an absolute timeline for each list item.
                 # from_start: start time is absolute from long-action start.
                 # after_prev: start time is tied to end of the previous list item.
-                for idx, item in enumerate(items):
+                for item in items:
                     hold_sec = max(0.0, float(_sample_delay_cfg(item.get("hold"), 0.2)))
-                    activate_mode = "from_start" if str(item.get("activate_mode", "")).lower() == "from_start" else "after_prev"
-                    if activate_mode == "from_start":
+                    # items come from _normalize_long_press_item: identity compare is enough
+                    if item.get("activate_mode") is _FROM_START:
                         start_sec = max(0.0, float(_sample_delay_cfg(item.get("start_delay"), 0.0)))
                     else:
                         start_sec = max(0.0, float(prev_end))
                     end_sec = start_sec + hold_sec
                     prev_end = end_sec
-                    plan.append({
-                        "index": int(idx),
-                        "trigger": normalize_trigger(item.get("trigger", DEFAULT_TRIGGER)),
-                        "start_sec": float(start_sec),
-                        "end_sec": float(end_sec),
-                        "hold_sec": float(hold_sec),
-                        "mode": activate_mode,
-                    })
-
-                total_items = len(plan)
-                self.signals.current.emit(f"Выполняю действия продолжительного нажатия: {total_items}")
-
-                events: List[Tuple[float, int, int, str]] = []
-                for p in plan:
-                    idx = int(p["index"])
-                    # Event sorting key:
-                    # 1) time
-                    # 2) item index (preserve list order ties)
-                    # 3) event order (start before end for same item/time)
-                    events.append((float(p["start_sec"]), idx, 0, "start"))
-                    events.append((float(p["end_sec"]), idx, 1, "end"))
-                events.sort(key=lambda e: (e[0], e[1], e[2]))
-
+                    triggers.append(normalize_trigger(item.get("trigger", DEFAULT_TRIGGER)))
+                    start_secs.append(float(start_sec))
+                    end_secs.append(float(end_sec))
+                    hold_secs.append(float(hold_sec))
+
+                perf = time.perf_counter
+                stop_is_set = self._stop.is_set
+                emit_current = self.signals.current.emit
+
+                total_items = len(triggers)
+                emit_current(f"Выполняю действия продолжительного нажатия: {total_items}")
+
+                # Event tuples sort by:
+                # 1) time
+                # 2) item index (preserve list order ties)
+                # 3) event order (0 = start before 1 = end for same item/time)
+                # Only starts go in up front; each end is pushed when its start fires
+                # (end >= start, so the pop order matches a full sort).
+                events: List[Tuple[float, int, int]] = [(start_secs[idx], idx, 0) for idx in range(total_items)]
+                if total_items > 1:
+                    heapq.heapify(events)
+                heappop = heapq.heappop
+                heappush = heapq.heappush
+
+                # Per call on purpose: one small dict per long-press action, and the
+                # finally below must only release this call's holds.
                 active_holds: Dict[int, Dict[str, Any]] = {}
-                started_at = time.perf_counter()
+                started_at = perf()
 
                 try:
-                    for rel_sec, idx, _ord, ev_type in events:
-                        if self._stop.is_set():
+                    while events:
+                        if stop_is_set():
                             return False
+                        rel_sec, idx, ev_ord = heappop(events)
                         if restart_from_beginning:
                             return True
                         if not _wait_if_paused():
                             return False
 
-                        target_at = started_at + float(rel_sec)
-                        wait_sec = max(0.0, target_at - time.perf_counter())
+                        target_at = started_at + rel_sec
+                        wait_sec = max(0.0, target_at - perf())
                         if wait_sec > 0 and (not _sleep_checked(wait_sec)):
                             return False
 
-                        if self._stop.is_set():
+                        if stop_is_set():
                             return False
                         if restart_from_beginning:
                             return True
 
-                        p = plan[idx]
-                        if ev_type == "start":
-                            self.signals.current.emit(
-                                f"Продолжительное нажатие {idx + 1}/{total_items}: старт +{p['start_sec']:.3f}s, удержание {p['hold_sec']:.3f}s"
+                        if ev_ord == 0:
+                            emit_current(
+                                f"Продолжительное нажатие {idx + 1}/{total_items}: старт +{start_secs[idx]:.3f}s, удержание {hold_secs[idx]:.3f}s"
                             )
-                            active_holds[idx] = _press_hold_trigger(p["trigger"])
+                            active_holds[idx] = _press_hold_trigger(triggers[idx])
+                            heappush(events, (end_secs[idx], idx, 1))
                             continue
 
                         hold_handle = active_holds.pop(idx, None)
                         _release_hold_trigger(hold_handle)
                         done += 1
-                        self.signals.progress.emit(done, total)
+                        _emit_progress()
 
-                    return not self._stop.is_set()
+                    return not stop_is_set()
                 finally:
                     # Ensure no key/button remains pressed on stop/error.
-                    for idx in sorted(list(active_holds.keys()), reverse=True):
-                        _release_hold_trigger(active_holds.get(idx))
+                    # LIFO by press order (dicts keep insertion order).
+                    for hold_handle in reversed(active_holds.values()):
+                        _release_hold_trigger(hold_handle)
                     active_holds.clear()
 
+            def _run_word_search(a_word: WordAreaAction, owner_idx: int, *, emit_ok: bool) -> bool:
+                """Word search + optional click. False = abort (stop / failed on-fail branch)."""
+                nonlocal current_area, move_mouse_ready
+
+                if not self._ocr_available:
+                    _emit_ocr_skip_notice()
+                    if emit_ok:
+                        self.signals.action_ok.emit(owner_idx)
+                    self.signals.current.emit(f"Область слова '{a_word.word}' пропущена: OCR/Tesseract не установлен.")
+                    return True
+
+                max_tries, search_infinite, on_fail, RETRY_DELAY, ROUND_DELAY = _word_search_cfg(a_word)
+                # invariant per search: bind once instead of per attempt
+                word = a_word.word
+                # OCR runs on the pool so stop() is honoured mid-recognition
+                resolve_word = functools.partial(self._ocr_call, a_word.resolve_target_rect_global)
+
+                if search_infinite:
+                    attempt = 0
+                    found = None
+                    while True:
+                        if self._stop.is_set():
+                            return False
+                        if not _wait_if_paused():
+                            return False
+                        attempt += 1
+                        found = resolve_word(base_area, current_dpr)
+                        if _rect_usable(found):
+                            break
+                        if _retry_status_due(attempt):
+                            self.signals.current.emit(
+                                f"Слово '{word}' не найдено (попытка {attempt}) - повтор..."
+                            )
+                        if RETRY_DELAY > 0 and (not _wait_stop(RETRY_DELAY)):
+                            return False
+                    if _rect_usable(found):
+                        current_area = found
+                        move_mouse_ready = True
+                        if emit_ok:
+                            self.signals.action_ok.emit(owner_idx)
+                        self.signals.current.emit(
+                            f"Область слова: '{word}' №{a_word.index} -> "
+                            f"{found.left()},{found.top()} → {found.right()},{found.bottom()}"
+                        )
+                        if a_word.click:
+                            c = found.center()
+                            smooth_move_to(c.x(), c.y(), 0.05)
+                            perform_trigger_times(
+                                a_word.trigger,
+                                a_word.multiplier,
+                                a_word.delay,
+                            )
+                    return True
+
+                while True:
+                    if self._stop.is_set():
+                        return False
+                    if not _wait_if_paused():
+                        return False
+                    found = None
+                    for attempt in range(1, max_tries + 1):
+                        if self._stop.is_set():
+                            return False
+                        if not _wait_if_paused():
+                            return False
+                        found = resolve_word(base_area, current_dpr)
+                        if _rect_usable(found):
+                            break
+                        if attempt < max_tries:
+                            if _retry_status_due(attempt):
+                                self.signals.current.emit(
+                                    f"Слово '{word}' не найдено (попытка {attempt}/{max_tries}) - повтор..."
+                                )
+                            if RETRY_DELAY > 0 and (not _wait_stop(RETRY_DELAY)):
+                                return False
+
+                    if _rect_usable(found):
+                        current_area = found
+                        move_mouse_ready = True
+                        if emit_ok:
+                            self.signals.action_ok.emit(owner_idx)
+                        self.signals.current.emit(
+                            f"Область слова: '{word}' №{a_word.index} -> "
+                            f"{found.left()},{found.top()} → {found.right()},{found.bottom()}"
+                        )
+                        if a_word.click:
+                            c = found.center()
+                            smooth_move_to(c.x(), c.y(), 0.05)
+                            perform_trigger_times(
+                                a_word.trigger,
+                                a_word.multiplier,
+                                a_word.delay,
+                            )
+                        return True
+
+                    msg = f"Не смог найти слово '{word}' в зоне после {max_tries} попыток."
+                    self.signals.action_error.emit(owner_idx, msg)
+                    self.signals.current.emit(msg)
+                    if on_fail == "error":
+                        self._mark_end("error", msg)
+                        self.signals.status.emit(msg)
+                        self._stop.set()
+                        return False
+                    if on_fail == "action":
+                        if not _execute_inline_actions(getattr(a_word, "on_fail_actions", []) or [], owner_idx):
+                            return False
+                        if restart_from_beginning:
+                            return True
+                        if not _apply_on_fail_post_mode(a_word):
+                            return False
+                        return True
+
+                    wait_msg = f"Повтор поиска через {int(ROUND_DELAY)}с..."
+                    self.signals.current.emit(wait_msg)
+                    if not _wait_stop(ROUND_DELAY):
+                        return False
+
+
             def _execute_inline_action(a_inline: Action, owner_idx: int) -> bool:
                 nonlocal current_area, move_mouse_ready, done, total, base_area, current_dpr
 
                 if self._stop.is_set():
                     return False
 
-                if isinstance(a_inline, BaseAreaAction):
+                kind = _action_kind(a_inline)
+                if kind == _K_BASE:
                     base_area = a_inline.rect()
                     current_dpr = 1.0
                     current_area = base_area
@@ -889,237 +1379,110 @@ class MacroPlayer(QThread):
                     )
                     return True
 
-                if isinstance(a_inline, AreaAction):
+                if kind == _K_AREA:
                     area_rect = a_inline.rect_global(base_area)
                     current_area = area_rect
                     move_mouse_ready = True
-                    self.signals.current.emit(
-                        f"Область: {area_rect.left()},{area_rect.top()} → {area_rect.right()},{area_rect.bottom()}"
-                    )
-                    if a_inline.click and area_rect.isValid() and area_rect.width() > 2 and area_rect.height() > 2:
-                        cx = (area_rect.left() + area_rect.right()) // 2
-                        cy = (area_rect.top() + area_rect.bottom()) // 2
-                        smooth_move_to(cx, cy, 0.05)
+                    if _area_status_due():
+                        self.signals.current.emit(
+                            f"Область: {area_rect.left()},{area_rect.top()} → {area_rect.right()},{area_rect.bottom()}"
+                        )
+                    if a_inline.click and _rect_usable(area_rect):
+                        c = area_rect.center()
+                        smooth_move_to(c.x(), c.y(), 0.05)
                         perform_trigger_times(
-                            getattr(a_inline, "trigger", DEFAULT_TRIGGER),
+                            a_inline.trigger,
                             a_inline.multiplier,
                             a_inline.delay,
                         )
                     return True
 
-                if isinstance(a_inline, WaitEventAction):
-                    if not ocr_available:
+                if kind == _K_WAIT_EVENT:
+                    if not self._ocr_available:
                         _emit_ocr_skip_notice()
                         self.signals.current.emit("Ожидание события пропущено: OCR/Tesseract не установлен.")
                         done += 1
-                        self.signals.progress.emit(done, total)
+                        _emit_progress()
                         return True
 
                     watch_rect = a_inline.rect_global(base_area)
-                    if not watch_rect or not watch_rect.isValid() or watch_rect.width() < 2 or watch_rect.height() < 2:
+                    if not _rect_usable(watch_rect, 2):
                         msg = "Ожидание события: область не задана или пуста."
                         self.signals.action_error.emit(owner_idx, msg)
                         self.signals.current.emit(msg)
                         done += 1
-                        self.signals.progress.emit(done, total)
+                        _emit_progress()
                         return True
 
-                    desc = action_to_display(a_inline)[1]
-                    poll = max(0.1, float(getattr(a_inline, "poll", 1.0)))
+                    desc = self._display_for(a_inline)
+                    poll = max(0.1, float(a_inline.poll))
+                    # долгое ожидание: интервал растёт после каждого промаха (до WAIT_EVENT_POLL_MAX_SEC)
+                    poll_cap = max(poll, float(WAIT_EVENT_POLL_MAX_SEC))
+                    backoff = max(1.0, float(WAIT_EVENT_POLL_BACKOFF))
+                    cur_poll = poll
+                    perf = time.perf_counter
+                    ocr_resolve = self._ocr_resolve
                     self.signals.current.emit(f"Ожидание события: {desc}")
                     while not self._stop.is_set():
                         if not _wait_if_paused():
                             return False
-                        found = a_inline.resolve_target_rect_global(base_area, dpr_override=current_dpr)
-                        ok = bool(found and found.isValid() and found.width() > 2 and found.height() > 2)
-                        if ok:
+                        # poll period counts from probe start, so OCR time is not added on top
+                        deadline = perf() + cur_poll
+                        found = ocr_resolve(a_inline, base_area, current_dpr)
+                        if _rect_usable(found):
                             self.signals.current.emit(f"Ожидание события выполнено: {desc}")
-                            if found and found.isValid():
-                                current_area = found
-                            elif watch_rect and watch_rect.isValid():
-                                current_area = watch_rect
+                            current_area = found
                             done += 1
-                            self.signals.progress.emit(done, total)
+                            _emit_progress()
                             return True
-                        if not _sleep_checked(poll):
+                        cur_poll = min(poll_cap, cur_poll * backoff)
+                        if not _wait_stop(max(_WAIT_EVENT_MIN_GAP, deadline - perf())):
                             return False
                     return False
 
-                if isinstance(a_inline, WaitAction):
-                    t = a_inline.delay.sample()
+                if kind == _K_WAIT:
+                    t = a_inline.delay.sample(rng)
                     self.signals.current.emit(f"Ожидание: {t:.3f}с")
                     if not _sleep_checked(t):
                         return False
                     done += 1
-                    self.signals.progress.emit(done, total)
+                    _emit_progress()
                     return True
 
-                if isinstance(a_inline, WordAreaAction):
-                    if not ocr_available:
-                        _emit_ocr_skip_notice()
-                        self.signals.current.emit(f"Область слова '{a_inline.word}' пропущена: OCR/Tesseract не установлен.")
-                        return True
-
-                    RETRY_DELAY = 0.12
-                    ROUND_DELAY = 5.0
-                    try:
-                        max_tries = int(getattr(a_inline, "search_max_tries", 100))
-                    except Exception:
-                        max_tries = 100
-                    if max_tries < 1:
-                        max_tries = 1
-                    search_infinite = bool(getattr(a_inline, "search_infinite", True))
-                    on_fail = str(getattr(a_inline, "search_on_fail", "retry") or "retry")
-                    if on_fail not in ("retry", "error", "action"):
-                        on_fail = "retry"
-
-                    if search_infinite:
-                        attempt = 0
-                        found = None
-                        while True:
-                            if self._stop.is_set():
-                                return False
-                            if not _wait_if_paused():
-                                return False
-                            attempt += 1
-                            found = a_inline.resolve_target_rect_global(base_area, dpr_override=current_dpr)
-                            if found and found.isValid() and found.width() > 2 and found.height() > 2:
-                                break
-                            self.signals.current.emit(
-                                f"Слово '{a_inline.word}' не найдено (попытка {attempt}) - повтор..."
-                            )
-                            if RETRY_DELAY > 0 and (not _sleep_checked(RETRY_DELAY)):
-                                return False
-                        if found and found.isValid() and found.width() > 2 and found.height() > 2:
-                            current_area = found
-                            move_mouse_ready = True
-                            self.signals.current.emit(
-                                f"Область слова: '{a_inline.word}' №{a_inline.index} -> "
-                                f"{found.left()},{found.top()} → {found.right()},{found.bottom()}"
-                            )
-                            if a_inline.click:
-                                cx = (found.left() + found.right()) // 2
-                                cy = (found.top() + found.bottom()) // 2
-                                smooth_move_to(cx, cy, 0.05)
-                                perform_trigger_times(
-                                    getattr(a_inline, "trigger", DEFAULT_TRIGGER),
-                                    a_inline.multiplier,
-                                    a_inline.delay,
-                                )
-                        return True
-
-                    while True:
-                        if self._stop.is_set():
-                            return False
-                        if not _wait_if_paused():
-                            return False
-                        found = None
-                        for attempt in range(1, max_tries + 1):
-                            if self._stop.is_set():
-                                return False
-                            if not _wait_if_paused():
-                                return False
-                            found = a_inline.resolve_target_rect_global(base_area, dpr_override=current_dpr)
-                            if found and found.isValid() and found.width() > 2 and found.height() > 2:
-                                break
-                            if attempt < max_tries:
-                                self.signals.current.emit(
-                                    f"Слово '{a_inline.word}' не найдено (попытка {attempt}/{max_tries}) - повтор..."
-                                )
-                                if RETRY_DELAY > 0 and (not _sleep_checked(RETRY_DELAY)):
-                                    return False
-
-                        if found and found.isValid() and found.width() > 2 and found.height() > 2:
-                            current_area = found
-                            move_mouse_ready = True
-                            self.signals.current.emit(
-                                f"Область слова: '{a_inline.word}' №{a_inline.index} -> "
-                                f"{found.left()},{found.top()} → {found.right()},{found.bottom()}"
-                            )
-                            if a_inline.click:
-                                cx = (found.left() + found.right()) // 2
-                                cy = (found.top() + found.bottom()) // 2
-                                smooth_move_to(cx, cy, 0.05)
-                                perform_trigger_times(
-                                    getattr(a_inline, "trigger", DEFAULT_TRIGGER),
-                                    a_inline.multiplier,
-                                    a_inline.delay,
-                                )
-                            return True
-
-                        msg = f"Не смог найти слово '{a_inline.word}' в зоне после {max_tries} попыток."
-                        self.signals.action_error.emit(owner_idx, msg)
-                        self.signals.current.emit(msg)
-                        if on_fail == "error":
-                            self._mark_end("error", msg)
-                            self.signals.status.emit(msg)
-                            self._stop.set()
-                            return False
-                        if on_fail == "action":
-                            if not _execute_inline_actions(getattr(a_inline, "on_fail_actions", []) or [], owner_idx):
-                                return False
-                            if restart_from_beginning:
-                                return True
-                            if not _apply_on_fail_post_mode(a_inline):
-                                return False
-                            return True
-
-                        wait_msg = f"Повтор поиска через {int(ROUND_DELAY)}с..."
-                        self.signals.current.emit(wait_msg)
-                        if not _sleep_checked(ROUND_DELAY):
-                            return False
+                if kind == _K_WORD:
+                    return _run_word_search(a_inline, owner_idx, emit_ok=False)
 
                 # KeyAction
-                detail = action_to_display(a_inline)[1]
+                detail = self._display_for(a_inline)
                 self.signals.current.emit(detail)
-                mode = _normalize_key_press_mode(getattr(a_inline, "press_mode", "normal"))
+                mode = _normalize_key_press_mode(a_inline.press_mode)
                 if mode == "long":
                     if not _execute_key_long_press_items(_key_long_action_items(a_inline), owner_idx):
                         return False
                     return True
 
                 reps = max(1, int(a_inline.multiplier))
-                for _r_i in range(reps):
-                    if self._stop.is_set():
-                        return False
-                    t = a_inline.delay.sample()
-                    if (move_mouse_ready and current_area and current_area.isValid() and
-                            current_area.width() > 2 and current_area.height() > 2):
-                        tx = random.randint(current_area.left() + 1, current_area.right() - 1)
-                        ty = random.randint(current_area.top() + 1, current_area.bottom() - 1)
-                        smooth_move_to(tx, ty, t)
-                    else:
-                        if t > 0 and (not _sleep_checked(t)):
+                jitter = _jitter_bounds(current_area) if move_mouse_ready else None
+                targets = _jitter_points(rng, jitter, reps) if jitter is not None else None
+                stop_is_set = self._stop.is_set
+                sample = a_inline.delay.sample
+                do_once = _key_once(a_inline)
+                for r_i in range(reps):
+                    # one stop check per repetition: the move/sleep reports a stop itself
+                    t = sample(rng)
+                    if targets is not None:
+                        tx, ty = targets[r_i]
+                        if not smooth_move_to(tx, ty, t):
                             return False
-
-                    if self._stop.is_set():
+                    elif t > 0:
+                        if not _sleep_checked(t):
+                            return False
+                    elif stop_is_set():
                         return False
 
-                    if a_inline.kind == "mouse" and a_inline.mouse_button:
-                        mods_only = [k for k in a_inline.keys if k in ("Shift", "Ctrl", "Alt", "Meta")]
-                        mod_pks = []
-                        for mname in mods_only:
-                            pk = k_to_pynput(mname)
-                            if pk is not None:
-                                mod_pks.append(pk)
-                        for pk in mod_pks:
-                            if self._stop.is_set():
-                                return False
-                            kb.press(pk)
-                            _sleep_checked(0.005)
-                        _sleep_checked(0.020)
-                        if not self._stop.is_set():
-                            click(a_inline.mouse_button)
-                        for pk in reversed(mod_pks):
-                            try:
-                                kb.release(pk)
-                            except Exception:
-                                pass
-                    else:
-                        press_combo(a_inline.keys)
-
+                    do_once()
                     done += 1
-                    self.signals.progress.emit(done, total)
+                    _emit_progress()
                 return True
 
             def _execute_inline_actions(
@@ -1129,9 +1492,12 @@ class MacroPlayer(QThread):
                 extend_total: bool = True,
             ) -> bool:
                 nonlocal total
-                seq = _build_inline_action_seq(raw_actions)
                 source = str(source_label or "").strip() or "дополнительных действий"
+                if not raw_actions:
+                    self.signals.current.emit(f"Список действий для {source} пуст.")
+                    return True
 
+                seq = self._inline_seq(raw_actions)
                 if not seq:
                     self.signals.current.emit(f"Список действий для {source} пуст.")
                     return True
@@ -1156,18 +1522,20 @@ class MacroPlayer(QThread):
 
                 cycle_num += 1
                 self.signals.current.emit(f"Старт цикла #{cycle_num}")
+                self._frame_cache.clear()
                 # run actions
                 for idx in range(start_index, len(actions)):
                     if restart_from_beginning:
                         break
                     a = actions[idx]
+                    kind = kinds[idx]
                     if self._stop.is_set():
                         break
                     # NEW: РѕР±РЅРѕРІР»СЏРµРј СЃРЅР°РїС€РѕС‚ РґР»СЏ СЃС‚РѕРї-СЃР»РѕРІР°
                     _sw_set_snapshot(base_area, locals().get("current_dpr", 1.0))
 
 
-                    if isinstance(a, BaseAreaAction):
+                    if kind == _K_BASE:
                         runtime_rect, current_dpr, runtime_hwnd = _resolve_runtime_base()
 
                         if self._bound_exe and (runtime_rect is None or not runtime_rect.isValid()):
@@ -1190,142 +1558,16 @@ class MacroPlayer(QThread):
                             f"Базовая область: {base_area.left()},{base_area.top()} → {base_area.right()},{base_area.bottom()}"
                         )
 
-                        if a.click and base_area.isValid() and base_area.width() > 2 and base_area.height() > 2:
-                            cx = (base_area.left() + base_area.right()) // 2
-                            cy = (base_area.top() + base_area.bottom()) // 2
-                            smooth_move_to(cx, cy, 0.05)
-                            perform_trigger_times(getattr(a, "trigger", DEFAULT_TRIGGER), 1)
+                        if a.click and _rect_usable(base_area):
+                            c = base_area.center()
+                            smooth_move_to(c.x(), c.y(), 0.05)
+                            perform_trigger_times(a.trigger, 1)
                         continue
 
                     self.signals.action_row.emit(idx)  # <-- Р’РћРў РўРЈРў, РЅР° РѕРґРЅРѕРј СѓСЂРѕРІРЅРµ СЃ if
 
-                    if isinstance(a, WordAreaAction):
-                        if not ocr_available:
-                            _emit_ocr_skip_notice()
-                            self.signals.action_ok.emit(idx)
-                            self.signals.current.emit(f"Область слова '{a.word}' пропущена: OCR/Tesseract не установлен.")
-                            continue
-
-                        RETRY_DELAY = 0.12
-                        ROUND_DELAY = 5.0
-                        try:
-                            max_tries = int(getattr(a, "search_max_tries", 100))
-                        except Exception:
-                            max_tries = 100
-                        if max_tries < 1:
-                            max_tries = 1
-                        search_infinite = bool(getattr(a, "search_infinite", True))
-                        on_fail = str(getattr(a, "search_on_fail", "retry") or "retry")
-                        if on_fail not in ("retry", "error", "action"):
-                            on_fail = "retry"
-
-                        if search_infinite:
-                            attempt = 0
-                            found = None
-                            while True:
-                                if self._stop.is_set():
-                                    break
-                                if not _wait_if_paused():
-                                    break
-
-                                attempt += 1
-                                found = a.resolve_target_rect_global(base_area, dpr_override=current_dpr)
-                                if found and found.isValid() and found.width() > 2 and found.height() > 2:
-                                    break
-
-                                self.signals.current.emit(
-                                    f"Слово '{a.word}' не найдено (попытка {attempt}) - повтор..."
-                                )
-                                if RETRY_DELAY > 0:
-                                    if not _sleep_checked(RETRY_DELAY):
-                                        break
-
-                            if self._stop.is_set():
-                                break
-
-                            if found and found.isValid() and found.width() > 2 and found.height() > 2:
-                                current_area = found
-                                move_mouse_ready = True
-                                self.signals.action_ok.emit(idx)
-                                self.signals.current.emit(
-                                    f"Область слова: '{a.word}' №{a.index} -> "
-                                    f"{found.left()},{found.top()} → {found.right()},{found.bottom()}"
-                                )
-
-                                if a.click:
-                                    cx = (found.left() + found.right()) // 2
-                                    cy = (found.top() + found.bottom()) // 2
-                                    smooth_move_to(cx, cy, 0.05)
-                                    perform_trigger_times(getattr(a, "trigger", DEFAULT_TRIGGER), a.multiplier, a.delay)
-                            continue
-
-                        while True:
-                            if self._stop.is_set():
-                                break
-                            if not _wait_if_paused():
-                                break
-
-                            found = None
-
-                            for attempt in range(1, max_tries + 1):
-                                if self._stop.is_set():
-                                    break
-                                if not _wait_if_paused():
-                                    break
-
-                                found = a.resolve_target_rect_global(base_area, dpr_override=current_dpr)
-                                if found and found.isValid() and found.width() > 2 and found.height() > 2:
-                                    break
-
-                                if attempt < max_tries:
-                                    self.signals.current.emit(
-                                        f"Слово '{a.word}' не найдено (попытка {attempt}/{max_tries}) - повтор..."
-                                    )
-                                    if RETRY_DELAY > 0:
-                                        if not _sleep_checked(RETRY_DELAY):
-                                            break
-
-                            if self._stop.is_set():
-                                break
-
-                            if found and found.isValid() and found.width() > 2 and found.height() > 2:
-                                current_area = found
-                                move_mouse_ready = True
-                                self.signals.action_ok.emit(idx)
-                                self.signals.current.emit(
-                                    f"Область слова: '{a.word}' №{a.index} -> "
-                                    f"{found.left()},{found.top()} → {found.right()},{found.bottom()}"
-                                )
-
-                                if a.click:
-                                    cx = (found.left() + found.right()) // 2
-                                    cy = (found.top() + found.bottom()) // 2
-                                    smooth_move_to(cx, cy, 0.05)
-                                    perform_trigger_times(getattr(a, "trigger", DEFAULT_TRIGGER), a.multiplier, a.delay)
-                                break
-
-                            msg = f"Не смог найти слово '{a.word}' в зоне после {max_tries} попыток."
-                            self.signals.action_error.emit(idx, msg)
-                            self.signals.current.emit(msg)
-
-                            if on_fail == "error":
-                                self._mark_end("error", msg)
-                                self.signals.status.emit(msg)
-                                self._stop.set()
-                                break
-                            if on_fail == "action":
-                                if not _execute_inline_actions(getattr(a, "on_fail_actions", []) or [], idx):
-                                    break
-                                if restart_from_beginning:
-                                    break
-                                if not _apply_on_fail_post_mode(a):
-                                    break
-                                break
-
-                            wait_msg = f"Повтор поиска через {int(ROUND_DELAY)}с..."
-                            self.signals.current.emit(wait_msg)
-                            if not _sleep_checked(ROUND_DELAY):
-                                break
+                    if kind == _K_WORD:
+                        _run_word_search(a, idx, emit_ok=True)
 
                         if self._stop.is_set():
                             break
@@ -1339,136 +1581,113 @@ class MacroPlayer(QThread):
                         if self._stop.is_set():
                             break
 
-                    if isinstance(a, AreaAction):
+                    if kind == _K_AREA:
                         current_area = a.rect_global(base_area)
                         move_mouse_ready = True
-                        self.signals.current.emit(
-                            f"Область: {current_area.left()},{current_area.top()} → {current_area.right()},{current_area.bottom()}")
+                        if _area_status_due():
+                            self.signals.current.emit(
+                                f"Область: {current_area.left()},{current_area.top()} → {current_area.right()},{current_area.bottom()}")
 
-                        if a.click and current_area.isValid() and current_area.width() > 2 and current_area.height() > 2:
-                            cx = (current_area.left() + current_area.right()) // 2
-                            cy = (current_area.top() + current_area.bottom()) // 2
-                            smooth_move_to(cx, cy, 0.05)
-                            perform_trigger_times(getattr(a, "trigger", DEFAULT_TRIGGER), a.multiplier, a.delay)
+                        if a.click and _rect_usable(current_area):
+                            c = current_area.center()
+                            smooth_move_to(c.x(), c.y(), 0.05)
+                            perform_trigger_times(a.trigger, a.multiplier, a.delay)
 
                         continue
 
-                    if isinstance(a, WaitEventAction):
-                        if not ocr_available:
+                    if kind == _K_WAIT_EVENT:
+                        if not self._ocr_available:
                             _emit_ocr_skip_notice()
                             self.signals.action_ok.emit(idx)
                             self.signals.current.emit("Ожидание события пропущено: OCR/Tesseract не установлен.")
                             done += 1
-                            self.signals.progress.emit(done, total)
+                            _emit_progress()
                             continue
 
                         watch_rect = a.rect_global(base_area)
-                        if not watch_rect or not watch_rect.isValid() or watch_rect.width() < 2 or watch_rect.height() < 2:
+                        if not _rect_usable(watch_rect, 2):
                             msg = "Ожидание события: область не задана или пуста."
                             self.signals.action_error.emit(idx, msg)
                             self.signals.current.emit(msg)
                             done += 1
-                            self.signals.progress.emit(done, total)
+                            _emit_progress()
                             continue
 
-                        desc = action_to_display(a)[1]
-                        poll = max(0.1, float(getattr(a, "poll", 1.0)))
+                        desc = self._display_for(a)
+                        poll = max(0.1, float(a.poll))
+                        # долгое ожидание: интервал растёт после каждого промаха (до WAIT_EVENT_POLL_MAX_SEC)
+                        poll_cap = max(poll, float(WAIT_EVENT_POLL_MAX_SEC))
+                        backoff = max(1.0, float(WAIT_EVENT_POLL_BACKOFF))
+                        cur_poll = poll
+                        perf = time.perf_counter
+                        ocr_resolve = self._ocr_resolve
                         self.signals.current.emit(f"Ожидание события: {desc}")
 
                         while not self._stop.is_set():
                             if not _wait_if_paused():
                                 break
 
-                            found = a.resolve_target_rect_global(base_area, dpr_override=current_dpr)
-                            ok = bool(found and found.isValid() and found.width() > 2 and found.height() > 2)
-
-                            if ok:
+                            # poll period counts from probe start, so OCR time is not added on top
+                            deadline = perf() + cur_poll
+                            found = ocr_resolve(a, base_area, current_dpr)
+                            if _rect_usable(found):
                                 self.signals.action_ok.emit(idx)
                                 self.signals.current.emit(f"Ожидание события выполнено: {desc}")
-                                if found and found.isValid():
-                                    current_area = found
-                                elif watch_rect and watch_rect.isValid():
-                                    current_area = watch_rect
+                                current_area = found
                                 done += 1
-                                self.signals.progress.emit(done, total)
+                                _emit_progress()
                                 break
 
-                            if not _sleep_checked(poll):
+                            cur_poll = min(poll_cap, cur_poll * backoff)
+                            if not _wait_stop(max(_WAIT_EVENT_MIN_GAP, deadline - perf())):
                                 break
 
                         continue
 
-                    if isinstance(a, WaitAction):
-                        t = a.delay.sample()
+                    if kind == _K_WAIT:
+                        t = a.delay.sample(rng)
                         self.signals.current.emit(f"Ожидание: {t:.3f}с")
                         if not _sleep_checked(t):
                             break
                         done += 1
-                        self.signals.progress.emit(done, total)
+                        _emit_progress()
 
                         continue
 
                     # KeyAction
-                    detail = action_to_display(a)[1]
+                    detail = self._display_for(a)
                     self.signals.current.emit(detail)
-                    mode = _normalize_key_press_mode(getattr(a, "press_mode", "normal"))
+                    mode = _normalize_key_press_mode(a.press_mode)
                     if mode == "long":
-                        if not _execute_key_long_press_items(_key_long_action_items(a), idx):
+                        if not _execute_key_long_press_items(_long_items_for(a), idx):
                             break
                         continue
 
                     reps = max(1, int(a.multiplier))
+                    jitter = _jitter_bounds(current_area) if move_mouse_ready else None
+                    targets = _jitter_points(rng, jitter, reps) if jitter is not None else None
+                    stop_is_set = self._stop.is_set
+                    sample = a.delay.sample
+                    do_once = _key_once(a)
                     for r_i in range(reps):
-                        if self._stop.is_set():
-                            break
-
-                        t = a.delay.sample()
-
-                        # move smoothly during the delay time
-                        if (move_mouse_ready and current_area and current_area.isValid() and
-                                current_area.width() > 2 and current_area.height() > 2):
-                            tx = random.randint(current_area.left() + 1, current_area.right() - 1)
-                            ty = random.randint(current_area.top() + 1, current_area.bottom() - 1)
-                            smooth_move_to(tx, ty, t)
-                        else:
-                            if t > 0:
-                                if not _sleep_checked(t):
-                                    break
+                        t = sample(rng)
 
-                        if self._stop.is_set():
+                        # move smoothly during the delay time; both paths report a stop
+                        if targets is not None:
+                            tx, ty = targets[r_i]
+                            if not smooth_move_to(tx, ty, t):
+                                break
+                        elif t > 0:
+                            if not _sleep_checked(t):
+                                break
+                        elif stop_is_set():
                             break
 
                         # do the actual action
-                        if a.kind == "mouse" and a.mouse_button:
-                            mods_only = [k for k in a.keys if k in ("Shift", "Ctrl", "Alt", "Meta")]
-
-                            # Р·Р°Р¶РёРјР°РµРј РјРѕРґС‹ РІСЂСѓС‡РЅСѓСЋ, РєР»РёРєР°РµРј, РѕС‚РїСѓСЃРєР°РµРј
-                            mod_pks = []
-                            for mname in mods_only:
-                                pk = k_to_pynput(mname)
-                                if pk is not None:
-                                    mod_pks.append(pk)
-
-                            for pk in mod_pks:
-                                if self._stop.is_set():
-                                    break
-                                kb.press(pk)
-                                _sleep_checked(0.005)
-
-                            _sleep_checked(0.020)  # РґР°С‚СЊ РёРіСЂРµ СѓРІРёРґРµС‚СЊ РјРѕРґС‹
-                            if not self._stop.is_set():
-                                click(a.mouse_button)
-
-                            for pk in reversed(mod_pks):
-                                try:
-                                    kb.release(pk)
-                                except Exception:
-                                    pass
-                        else:
-                            press_combo(a.keys)
+                        do_once()
 
                         done += 1
-                        self.signals.progress.emit(done, total)
+                        _emit_progress()
 
                 if self._stop.is_set():
                     break
@@ -1494,17 +1713,22 @@ class MacroPlayer(QThread):
                         break
 
                 # wait between cycles
-                d = self.record.repeat.delay.sample()
+                d = self.record.repeat.delay.sample(rng)
                 if d > 0:
                     self.signals.current.emit(f"Пауза перед повтором: {d:.3f}с")
                     if not _sleep_checked(d):
                         break
 
+            _flush_progress()
+
         except Exception as ex:
             msg = f"Ошибка в проигрывателе: {type(ex).__name__}: {ex}"
             self._mark_end("error", msg)
             self.signals.status.emit(msg)
         finally:
+            if self._ocr_pool is not None:
+                self._ocr_pool.shutdown(wait=False, cancel_futures=True)
+                self._ocr_pool = None
             # РµСЃР»Рё РїРѕС‚РѕРє РѕСЃС‚Р°РЅРѕРІРёР»Рё, РЅРѕ РїСЂРёС‡РёРЅСѓ РЅРµ РїСЂРѕСЃС‚Р°РІРёР»Рё
             if self._stop.is_set() and getattr(self, "end_state", "done") == "done":
                 self._mark_end("stopped", "Проигрывание остановлено.")
@@ -13,13 +13,14 @@ import time
 import ctypes
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Union
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple, Union
 
 from PySide6.QtCore import (
-    QAbstractAnimation, QEasingCurve, QEvent, QEventLoop, QPoint, QRect, QSize, Qt, QThread, QTimer, QUrl, Signal, QVariantAnimation
+    QEvent, QEventLoop, QPoint, QPointF, QRect, QRectF, QSize, Qt, QThread, QTimer, QUrl, Signal
 )
 from PySide6.QtGui import (
-    QAction, QActionGroup, QBrush, QColor, QDesktopServices, QFont, QGuiApplication, QKeySequence, QPainter, QPen, QShortcut
+    QAction, QActionGroup, QBrush, QColor, QDesktopServices, QFont, QGuiApplication, QKeySequence, QPainter, QPainterPath, QPen, QShortcut, QStaticText
 )
 from PySide6.QtWidgets import (
     QAbstractItemView, QAbstractSpinBox, QApplication, QButtonGroup, QCheckBox, QComboBox, QDoubleSpinBox, QFileDialog, QFormLayout,
@@ -54,10 +55,27 @@ class FlowLayout(QLayout):
         self._items = []
         self._h = hspacing
         self._v = vspacing
+        # Qt asks heightForWidth/minimumSize many times per resize; cleared on any item/layout change.
+        self._hfw_cache: Dict[int, int] = {}
+        self._min_size_cache: Optional[QSize] = None
+        self._laid_out_rect: Optional[QRect] = None  # rect of the last real placement pass
+        self._hints: List[Optional[QSize]] = []  # item sizeHint()s, parallel to _items
         self.setContentsMargins(margin, margin, margin, margin)
 
+    def _drop_size_caches(self):
+        self._hfw_cache.clear()
+        self._min_size_cache = None
+        self._laid_out_rect = None
+        self._hints = [None] * len(self._items)
+
+    def invalidate(self):
+        # also reached via child updateGeometry() (text/font/visibility changes)
+        self._drop_size_caches()
+        super().invalidate()
+
     def addItem(self, item):
         self._items.append(item)
+        self._drop_size_caches()
 
     def count(self):
         return len(self._items)
@@ -66,7 +84,11 @@ class FlowLayout(QLayout):
         return self._items[index] if 0 <= index < len(self._items) else None
 
     def takeAt(self, index):
-        return self._items.pop(index) if 0 <= index < len(self._items) else None
+        if not (0 <= index < len(self._items)):
+            return None
+        item = self._items.pop(index)
+        self._drop_size_caches()
+        return item
 
     def expandingDirections(self):
         return Qt.Orientations(0)
@@ -75,45 +97,70 @@ class FlowLayout(QLayout):
         return True
 
     def heightForWidth(self, width):
-        return self._do_layout(QRect(0, 0, width, 0), True)
+        cache = self._hfw_cache
+        h = cache.get(width)
+        if h is None:
+            if len(cache) >= 64:
+                cache.clear()
+            h = cache[width] = self._do_layout(QRect(0, 0, width, 0), True)
+        return h
 
     def setGeometry(self, rect):
         super().setGeometry(rect)
+        # parent re-layouts often hand back the same rect: children are already in place
+        if self._laid_out_rect is not None and rect == self._laid_out_rect:
+            return
         self._do_layout(rect, False)
+        self._laid_out_rect = QRect(rect)
 
     def sizeHint(self):
         return self.minimumSize()
 
     def minimumSize(self):
+        if self._min_size_cache is not None:
+            return QSize(self._min_size_cache)
         size = QSize(0, 0)
         for item in self._items:
             size = size.expandedTo(item.minimumSize())
         m = self.contentsMargins()
         size.setWidth(size.width() + m.left() + m.right())
         size.setHeight(size.height() + m.top() + m.bottom())
+        self._min_size_cache = QSize(size)
         return size
 
     def _do_layout(self, rect, test_only):
-        x = rect.x()
+        x0 = rect.x()
+        x = x0
         y = rect.y()
         line_h = 0
-        right = rect.x() + rect.width()
-
-        for item in self._items:
-            hint = item.sizeHint()
-            next_x = x + hint.width()
+        right = x0 + rect.width()
+        hspacing = self._h
+        vspacing = self._v
+        # one scratch rect for every item: QLayoutItem.setGeometry copies it
+        geom = None if test_only else QRect()
+
+        hints = self._hints
+        for i, item in enumerate(self._items):
+            hint = hints[i]
+            if hint is None:
+                hint = hints[i] = item.sizeHint()
+            hw = hint.width()
+            hh = hint.height()
+            next_x = x + hw
 
             if next_x > right and line_h > 0:
-                x = rect.x()
-                y += line_h + self._v
-                next_x = x + hint.width()
+                x = x0
+                y += line_h + vspacing
+                next_x = x + hw
                 line_h = 0
 
-            if not test_only:
-                item.setGeometry(QRect(QPoint(x, y), hint))
+            if geom is not None:
+                geom.setRect(x, y, hw, hh)
+                item.setGeometry(geom)
 
-            x = next_x + self._h
-            line_h = max(line_h, hint.height())
+            x = next_x + hspacing
+            if hh > line_h:
+                line_h = hh
 
         return (y + line_h) - rect.y()
 
@@ -143,321 +190,167 @@ class ClickableLabel(QLabel):
         super().mousePressEvent(e)
 
 
-class PressModeSlider(QWidget):
-    """Two-state segmented slider with animated thumb."""
+# ---- Segmented sliders: shared paint ----
+def _slider_palette(track_bg, track_border, thumb_bg, thumb_border, text_on, text_off):
+    return (
+        QColor(track_bg), QPen(QColor(track_border), 1),
+        QColor(thumb_bg), QPen(QColor(thumb_border), 1),
+        QColor(text_on), QColor(text_off),
+    )
 
-    modeChanged = Signal(str)
 
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self._mode = "normal"
-        self._pos = 0.0
-        self._labels = {
-            "normal": "Обычное нажатие",
-            "long": "Продолжительное нажатие",
-        }
-        self.setCursor(Qt.PointingHandCursor)
-        self.setFocusPolicy(Qt.StrongFocus)
-        self.setMinimumHeight(38)
-        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+# Built once: paintEvent runs per animation frame, colors/pens never change.
+# (hex strings are parsed here only, never on the paint path)
+_SLIDER_PALETTE_ENABLED = _slider_palette("#141821", "#2a3447", "#284162", "#4d78ad", "#f4f8ff", "#a9b3c7")
+_SLIDER_PALETTE_DISABLED = _slider_palette("#11161f", "#1f2633", "#1d2a3c", "#31465f", "#92a0b5", "#6f7f95")
 
-        self._anim = QVariantAnimation(self)
-        self._anim.setDuration(220)
-        self._anim.setEasingCurve(QEasingCurve.InOutCubic)
-        self._anim.valueChanged.connect(self._on_anim_value_changed)
 
-    def mode(self) -> str:
-        return self._mode
+_SLIDER_FRAME_MS = 33  # thumb animation ~30 fps: a binary toggle needs only a handful of frames
 
-    def set_mode(self, mode: str, *, animate: bool = True, emit_signal: bool = False):
-        mode_norm = "long" if str(mode or "").strip().lower() == "long" else "normal"
-        target = 1.0 if mode_norm == "long" else 0.0
-        changed = (mode_norm != self._mode)
-        self._mode = mode_norm
 
-        # Keep running animation if the same mode is requested again.
-        if not changed:
-            if animate:
-                return
-            if self._anim.state() != QAbstractAnimation.Stopped:
-                return
-            self._pos = float(target)
-            self.update()
-            return
+def _ease_in_out_cubic(t: float) -> float:
+    return 4.0 * t * t * t if t < 0.5 else 1.0 - ((-2.0 * t + 2.0) ** 3) / 2.0
 
-        if animate and self.isVisible():
-            self._anim.stop()
-            self._anim.setStartValue(float(self._pos))
-            self._anim.setEndValue(float(target))
-            self._anim.start()
-        else:
-            self._anim.stop()
-            self._pos = float(target)
-            self.update()
 
-        if changed and emit_signal:
-            self.modeChanged.emit(self._mode)
+def _slider_thumb_x(width: int, pos: float) -> int:
+    """Left edge of the slider thumb for widget width and position 0..1 (1px frame + 3px pad)."""
+    inner_w = width - 8
+    thumb_w = max(1, inner_w // 2)
+    return int(round(4 + (inner_w - thumb_w) * pos))
 
-    def _on_anim_value_changed(self, value):
-        try:
-            self._pos = float(value)
-        except Exception:
-            self._pos = 0.0
-        self.update()
 
-    def sizeHint(self):
-        return QSize(460, 40)
+def _prepared_static_text(text: str, font: QFont) -> QStaticText:
+    st = QStaticText(text)
+    st.setTextFormat(Qt.PlainText)
+    st.prepare(font=font)
+    return st
 
-    def mousePressEvent(self, e):
-        if not self.isEnabled():
-            return super().mousePressEvent(e)
-        new_mode = "normal" if e.position().x() < (self.width() / 2.0) else "long"
-        self.set_mode(new_mode, animate=True, emit_signal=True)
-        e.accept()
 
-    def keyPressEvent(self, e):
-        if e.key() in (Qt.Key_Left, Qt.Key_A):
-            self.set_mode("normal", animate=True, emit_signal=True)
-            e.accept()
-            return
-        if e.key() in (Qt.Key_Right, Qt.Key_D):
-            self.set_mode("long", animate=True, emit_signal=True)
-            e.accept()
-            return
-        if e.key() in (Qt.Key_Return, Qt.Key_Enter, Qt.Key_Space):
-            self.set_mode("long" if self._mode == "normal" else "normal", animate=True, emit_signal=True)
-            e.accept()
-            return
-        super().keyPressEvent(e)
+def _centered_text_origin(rect: QRect, st: QStaticText) -> QPointF:
+    size = st.size()
+    return QPointF(rect.x() + (rect.width() - size.width()) / 2, rect.y() + (rect.height() - size.height()) / 2)
 
-    def paintEvent(self, _):
-        p = QPainter(self)
-        p.setRenderHint(QPainter.Antialiasing, True)
-
-        r = self.rect().adjusted(1, 1, -1, -1)
-        if r.width() <= 8 or r.height() <= 8:
-            return
-
-        enabled = self.isEnabled()
-        track_bg = QColor("#141821")
-        track_border = QColor("#2a3447")
-        thumb_bg = QColor("#284162")
-        thumb_border = QColor("#4d78ad")
-        text_on = QColor("#f4f8ff")
-        text_off = QColor("#a9b3c7")
-        if not enabled:
-            track_bg = QColor("#11161f")
-            track_border = QColor("#1f2633")
-            thumb_bg = QColor("#1d2a3c")
-            thumb_border = QColor("#31465f")
-            text_on = QColor("#92a0b5")
-            text_off = QColor("#6f7f95")
-
-        p.setPen(QPen(track_border, 1))
-        p.setBrush(track_bg)
-        p.drawRoundedRect(r, 12, 12)
-
-        pad = 3
-        inner = r.adjusted(pad, pad, -pad, -pad)
-        half_w = max(1, inner.width() // 2)
-        thumb_w = half_w
-        thumb_x = int(round(inner.left() + (inner.width() - thumb_w) * float(self._pos)))
-        thumb = QRect(thumb_x, inner.top(), thumb_w, inner.height())
-
-        p.setPen(QPen(thumb_border, 1))
-        p.setBrush(thumb_bg)
-        p.drawRoundedRect(thumb, 9, 9)
-
-        left = QRect(inner.left(), inner.top(), half_w, inner.height())
-        right = QRect(inner.left() + half_w, inner.top(), inner.width() - half_w, inner.height())
-
-        p.setPen(text_on if self._mode == "normal" else text_off)
-        p.drawText(left, Qt.AlignCenter, i18n.tr(self._labels["normal"]))
-        p.setPen(text_on if self._mode == "long" else text_off)
-        p.drawText(right, Qt.AlignCenter, i18n.tr(self._labels["long"]))
-
-
-class WaitModeSlider(QWidget):
-    """Two-state segmented slider for wait action mode."""
 
-    modeChanged = Signal(str)
+def _paint_two_state_slider(w, left_src, right_src, left_active, track_radius, thumb_radius):
+    """Track, animated thumb (w._pos 0..1) and both labels.
 
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self._mode = "time"
-        self._pos = 0.0
-        self._labels = {
-            "time": "Время",
-            "event": "Событие",
-        }
-        self.setCursor(Qt.PointingHandCursor)
-        self.setFocusPolicy(Qt.StrongFocus)
-        self.setMinimumHeight(38)
-        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+    Labels are translated and laid out once per language/font as QStaticText, but still drawn
+    straight onto the widget so Windows keeps ClearType text.
+    """
+    p = QPainter(w)
+    p.setRenderHint(QPainter.Antialiasing, True)
 
-        self._anim = QVariantAnimation(self)
-        self._anim.setDuration(220)
-        self._anim.setEasingCurve(QEasingCurve.InOutCubic)
-        self._anim.valueChanged.connect(self._on_anim_value_changed)
+    r = w.rect().adjusted(1, 1, -1, -1)
+    if r.width() <= 8 or r.height() <= 8:
+        return
 
-    def mode(self) -> str:
-        return self._mode
+    track_bg, track_pen, thumb_bg, thumb_pen, text_on, text_off = (
+        _SLIDER_PALETTE_ENABLED if w.isEnabled() else _SLIDER_PALETTE_DISABLED
+    )
 
-    def set_mode(self, mode: str, *, animate: bool = True, emit_signal: bool = False):
-        mode_norm = "event" if str(mode or "").strip().lower() == "event" else "time"
-        target = 1.0 if mode_norm == "event" else 0.0
-        changed = (mode_norm != self._mode)
-        self._mode = mode_norm
+    # the track outline only changes with the widget size; keep its path between frames
+    path_key = (r.width(), r.height(), track_radius)
+    if w._track_path_key != path_key:
+        path = QPainterPath()
+        path.addRoundedRect(QRectF(r), track_radius, track_radius)
+        w._track_path = path
+        w._track_path_key = path_key
+    p.setPen(track_pen)
+    p.setBrush(track_bg)
+    p.drawPath(w._track_path)
 
-        # If the same mode is requested while an animation is already running,
-        # keep the current animation to avoid jump-then-animate artifacts.
-        if not changed:
-            if animate:
-                return
-            if self._anim.state() != QAbstractAnimation.Stopped:
-                return
-            self._pos = float(target)
-            self.update()
-            return
+    pad = 3
+    inner = r.adjusted(pad, pad, -pad, -pad)
+    half_w = max(1, inner.width() // 2)
+    thumb_w = half_w
+    thumb_x = int(round(inner.left() + (inner.width() - thumb_w) * float(w._pos)))
+    w._painted_thumb_x = thumb_x
+    thumb = QRect(thumb_x, inner.top(), thumb_w, inner.height())
 
-        if animate and self.isVisible():
-            self._anim.stop()
-            self._anim.setStartValue(float(self._pos))
-            self._anim.setEndValue(float(target))
-            self._anim.start()
-        else:
-            self._anim.stop()
-            self._pos = float(target)
-            self.update()
+    p.setPen(thumb_pen)
+    p.setBrush(thumb_bg)
+    p.drawRoundedRect(thumb, thumb_radius, thumb_radius)
 
-        if changed and emit_signal:
-            self.modeChanged.emit(self._mode)
+    font = w.font()
+    label_key = (i18n.get_language(), font.key())
+    labels = w._tr_labels
+    if labels is None or labels[0] != label_key:
+        labels = w._tr_labels = (
+            label_key, _prepared_static_text(i18n.tr(left_src), font), _prepared_static_text(i18n.tr(right_src), font)
+        )
 
-    def _on_anim_value_changed(self, value):
-        try:
-            self._pos = float(value)
-        except Exception:
-            self._pos = 0.0
-        self.update()
+    left = QRect(inner.left(), inner.top(), half_w, inner.height())
+    right = QRect(inner.left() + half_w, inner.top(), inner.width() - half_w, inner.height())
 
-    def sizeHint(self):
-        return QSize(460, 40)
+    p.setPen(text_on if left_active else text_off)
+    p.drawStaticText(_centered_text_origin(left, labels[1]), labels[1])
+    p.setPen(text_off if left_active else text_on)
+    p.drawStaticText(_centered_text_origin(right, labels[2]), labels[2])
 
-    def mousePressEvent(self, e):
-        if not self.isEnabled():
-            return super().mousePressEvent(e)
-        new_mode = "time" if e.position().x() < (self.width() / 2.0) else "event"
-        self.set_mode(new_mode, animate=True, emit_signal=True)
-        e.accept()
 
-    def keyPressEvent(self, e):
-        if e.key() in (Qt.Key_Left, Qt.Key_A):
-            self.set_mode("time", animate=True, emit_signal=True)
-            e.accept()
-            return
-        if e.key() in (Qt.Key_Right, Qt.Key_D):
-            self.set_mode("event", animate=True, emit_signal=True)
-            e.accept()
-            return
-        if e.key() in (Qt.Key_Return, Qt.Key_Enter, Qt.Key_Space):
-            self.set_mode("event" if self._mode == "time" else "time", animate=True, emit_signal=True)
-            e.accept()
-            return
-        super().keyPressEvent(e)
-
-    def paintEvent(self, _):
-        p = QPainter(self)
-        p.setRenderHint(QPainter.Antialiasing, True)
-
-        r = self.rect().adjusted(1, 1, -1, -1)
-        if r.width() <= 8 or r.height() <= 8:
-            return
-
-        enabled = self.isEnabled()
-        track_bg = QColor("#141821")
-        track_border = QColor("#2a3447")
-        thumb_bg = QColor("#284162")
-        thumb_border = QColor("#4d78ad")
-        text_on = QColor("#f4f8ff")
-        text_off = QColor("#a9b3c7")
-        if not enabled:
-            track_bg = QColor("#11161f")
-            track_border = QColor("#1f2633")
-            thumb_bg = QColor("#1d2a3c")
-            thumb_border = QColor("#31465f")
-            text_on = QColor("#92a0b5")
-            text_off = QColor("#6f7f95")
-
-        p.setPen(QPen(track_border, 1))
-        p.setBrush(track_bg)
-        p.drawRoundedRect(r, 12, 12)
-
-        pad = 3
-        inner = r.adjusted(pad, pad, -pad, -pad)
-        half_w = max(1, inner.width() // 2)
-        thumb_w = half_w
-        thumb_x = int(round(inner.left() + (inner.width() - thumb_w) * float(self._pos)))
-        thumb = QRect(thumb_x, inner.top(), thumb_w, inner.height())
-
-        p.setPen(QPen(thumb_border, 1))
-        p.setBrush(thumb_bg)
-        p.drawRoundedRect(thumb, 9, 9)
-
-        left = QRect(inner.left(), inner.top(), half_w, inner.height())
-        right = QRect(inner.left() + half_w, inner.top(), inner.width() - half_w, inner.height())
-
-        p.setPen(text_on if self._mode == "time" else text_off)
-        p.drawText(left, Qt.AlignCenter, i18n.tr(self._labels["time"]))
-        p.setPen(text_on if self._mode == "event" else text_off)
-        p.drawText(right, Qt.AlignCenter, i18n.tr(self._labels["event"]))
-
-
-class AreaModeSlider(QWidget):
-    """Two-state segmented slider for area action mode."""
+class _TwoStateSlider(QWidget):
+    """Two-state segmented slider with animated thumb; subclasses only declare modes and look."""
 
     modeChanged = Signal(str)
 
+    _MODES: Tuple[str, str] = ("a", "b")   # (left, right); left is the default
+    _LABELS: Tuple[str, str] = ("", "")
+    _TRACK_RADIUS = 12
+    _THUMB_RADIUS = 9
+    _MIN_HEIGHT = 38
+    _ANIM_MS = 220
+    _SIZE_HINT = (460, 40)
+
     def __init__(self, parent=None):
         super().__init__(parent)
-        self._mode = "screen"
+        self._mode = self._MODES[0]
         self._pos = 0.0
-        self._labels = {
-            "screen": "Экран",
-            "text": "Текст",
-        }
+        self._tr_labels = None  # ((language, font key), left, right) as prepared QStaticText
+        self._painted_thumb_x = None
+        self._track_path: Optional[QPainterPath] = None
+        self._track_path_key = None
         self.setCursor(Qt.PointingHandCursor)
         self.setFocusPolicy(Qt.StrongFocus)
-        self.setMinimumHeight(38)
+        self.setMinimumHeight(self._MIN_HEIGHT)
         self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
 
-        self._anim = QVariantAnimation(self)
-        self._anim.setDuration(220)
-        self._anim.setEasingCurve(QEasingCurve.InOutCubic)
-        self._anim.valueChanged.connect(self._on_anim_value_changed)
+        # Eased positions (0..1] for each frame, precomputed; the timer just walks them.
+        steps = max(1, int(round(self._ANIM_MS / _SLIDER_FRAME_MS)))
+        self._anim_curve = tuple(_ease_in_out_cubic(i / steps) for i in range(1, steps + 1))
+        self._anim_from = 0.0
+        self._anim_to = 0.0
+        self._anim_step = 0
+        self._anim = QTimer(self)
+        self._anim.setInterval(_SLIDER_FRAME_MS)
+        self._anim.timeout.connect(self._advance_anim)
 
     def mode(self) -> str:
         return self._mode
 
     def set_mode(self, mode: str, *, animate: bool = True, emit_signal: bool = False):
-        mode_norm = "text" if str(mode or "").strip().lower() == "text" else "screen"
-        target = 1.0 if mode_norm == "text" else 0.0
+        left_mode, right_mode = self._MODES
+        mode_norm = right_mode if str(mode or "").strip().lower() == right_mode else left_mode
+        target = 1.0 if mode_norm == right_mode else 0.0
         changed = (mode_norm != self._mode)
         self._mode = mode_norm
 
+        # If the same mode is requested while an animation is already running,
+        # keep the current animation to avoid jump-then-animate artifacts.
         if not changed:
             if animate:
                 return
-            if self._anim.state() != QAbstractAnimation.Stopped:
+            if self._anim.isActive():
                 return
             self._pos = float(target)
             self.update()
             return
 
         if animate and self.isVisible():
-            self._anim.stop()
-            self._anim.setStartValue(float(self._pos))
-            self._anim.setEndValue(float(target))
+            self._anim_from = float(self._pos)
+            self._anim_to = float(target)
+            self._anim_step = 0
             self._anim.start()
+            self.update()  # label colors flip now, before the thumb moves a pixel
         else:
             self._anim.stop()
             self._pos = float(target)
@@ -466,210 +359,105 @@ class AreaModeSlider(QWidget):
         if changed and emit_signal:
             self.modeChanged.emit(self._mode)
 
-    def _on_anim_value_changed(self, value):
-        try:
-            self._pos = float(value)
-        except Exception:
-            self._pos = 0.0
-        self.update()
+    def _advance_anim(self):
+        curve = self._anim_curve
+        step = self._anim_step
+        if step >= len(curve) - 1:
+            self._anim.stop()
+            step = len(curve) - 1
+        self._anim_step = step + 1
+        self._pos = self._anim_from + (self._anim_to - self._anim_from) * curve[step]
+        # repaint only on a visible step (near the ends of the ease the thumb barely moves)
+        if _slider_thumb_x(self.width(), self._pos) != self._painted_thumb_x:
+            self.update()
 
     def sizeHint(self):
-        return QSize(460, 40)
+        return QSize(*self._SIZE_HINT)
 
     def mousePressEvent(self, e):
         if not self.isEnabled():
             return super().mousePressEvent(e)
-        new_mode = "screen" if e.position().x() < (self.width() / 2.0) else "text"
+        new_mode = self._MODES[0] if e.position().x() < (self.width() / 2.0) else self._MODES[1]
         self.set_mode(new_mode, animate=True, emit_signal=True)
         e.accept()
 
     def keyPressEvent(self, e):
+        left_mode, right_mode = self._MODES
         if e.key() in (Qt.Key_Left, Qt.Key_A):
-            self.set_mode("screen", animate=True, emit_signal=True)
+            self.set_mode(left_mode, animate=True, emit_signal=True)
             e.accept()
             return
         if e.key() in (Qt.Key_Right, Qt.Key_D):
-            self.set_mode("text", animate=True, emit_signal=True)
+            self.set_mode(right_mode, animate=True, emit_signal=True)
             e.accept()
             return
         if e.key() in (Qt.Key_Return, Qt.Key_Enter, Qt.Key_Space):
-            self.set_mode("text" if self._mode == "screen" else "screen", animate=True, emit_signal=True)
+            self.set_mode(right_mode if self._mode == left_mode else left_mode, animate=True, emit_signal=True)
             e.accept()
             return
         super().keyPressEvent(e)
 
     def paintEvent(self, _):
-        p = QPainter(self)
-        p.setRenderHint(QPainter.Antialiasing, True)
-
-        r = self.rect().adjusted(1, 1, -1, -1)
-        if r.width() <= 8 or r.height() <= 8:
-            return
-
-        enabled = self.isEnabled()
-        track_bg = QColor("#141821")
-        track_border = QColor("#2a3447")
-        thumb_bg = QColor("#284162")
-        thumb_border = QColor("#4d78ad")
-        text_on = QColor("#f4f8ff")
-        text_off = QColor("#a9b3c7")
-        if not enabled:
-            track_bg = QColor("#11161f")
-            track_border = QColor("#1f2633")
-            thumb_bg = QColor("#1d2a3c")
-            thumb_border = QColor("#31465f")
-            text_on = QColor("#92a0b5")
-            text_off = QColor("#6f7f95")
-
-        p.setPen(QPen(track_border, 1))
-        p.setBrush(track_bg)
-        p.drawRoundedRect(r, 12, 12)
-
-        pad = 3
-        inner = r.adjusted(pad, pad, -pad, -pad)
-        half_w = max(1, inner.width() // 2)
-        thumb_w = half_w
-        thumb_x = int(round(inner.left() + (inner.width() - thumb_w) * float(self._pos)))
-        thumb = QRect(thumb_x, inner.top(), thumb_w, inner.height())
-
-        p.setPen(QPen(thumb_border, 1))
-        p.setBrush(thumb_bg)
-        p.drawRoundedRect(thumb, 9, 9)
-
-        left = QRect(inner.left(), inner.top(), half_w, inner.height())
-        right = QRect(inner.left() + half_w, inner.top(), inner.width() - half_w, inner.height())
-
-        p.setPen(text_on if self._mode == "screen" else text_off)
-        p.drawText(left, Qt.AlignCenter, i18n.tr(self._labels["screen"]))
-        p.setPen(text_on if self._mode == "text" else text_off)
-        p.drawText(right, Qt.AlignCenter, i18n.tr(self._labels["text"]))
-
-
-class LongActivationSlider(QWidget):
-    """Two-state segmented slider for long-press item activation mode."""
-
-    modeChanged = Signal(str)
-
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self._mode = "after_prev"
-        self._pos = 0.0
-        self._labels = {
-            "after_prev": "После предыдущего",
-            "from_start": "От старта действия",
-        }
-        self.setCursor(Qt.PointingHandCursor)
-        self.setFocusPolicy(Qt.StrongFocus)
-        self.setMinimumHeight(30)
-        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-
-        self._anim = QVariantAnimation(self)
-        self._anim.setDuration(180)
-        self._anim.setEasingCurve(QEasingCurve.InOutCubic)
-        self._anim.valueChanged.connect(self._on_anim_value_changed)
-
-    def mode(self) -> str:
-        return self._mode
-
-    def set_mode(self, mode: str, *, animate: bool = True, emit_signal: bool = False):
-        mode_norm = "from_start" if str(mode or "").strip().lower() == "from_start" else "after_prev"
-        target = 1.0 if mode_norm == "from_start" else 0.0
-        changed = (mode_norm != self._mode)
-        self._mode = mode_norm
+        _paint_two_state_slider(
+            self, self._LABELS[0], self._LABELS[1], self._mode == self._MODES[0],
+            self._TRACK_RADIUS, self._THUMB_RADIUS,
+        )
 
-        if animate and self.isVisible():
-            self._anim.stop()
-            self._anim.setStartValue(float(self._pos))
-            self._anim.setEndValue(float(target))
-            self._anim.start()
-        else:
-            self._pos = float(target)
-            self.update()
 
-        if changed and emit_signal:
-            self.modeChanged.emit(self._mode)
+class PressModeSlider(_TwoStateSlider):
+    """Key action press mode: normal / long."""
 
-    def _on_anim_value_changed(self, value):
-        try:
-            self._pos = float(value)
-        except Exception:
-            self._pos = 0.0
-        self.update()
+    _MODES = ("normal", "long")
+    _LABELS = ("Обычное нажатие", "Продолжительное нажатие")
 
-    def sizeHint(self):
-        return QSize(360, 32)
 
-    def mousePressEvent(self, e):
-        if not self.isEnabled():
-            return super().mousePressEvent(e)
-        new_mode = "after_prev" if e.position().x() < (self.width() / 2.0) else "from_start"
-        self.set_mode(new_mode, animate=True, emit_signal=True)
-        e.accept()
+class WaitModeSlider(_TwoStateSlider):
+    """Wait action mode: time / event."""
 
-    def keyPressEvent(self, e):
-        if e.key() in (Qt.Key_Left, Qt.Key_A):
-            self.set_mode("after_prev", animate=True, emit_signal=True)
-            e.accept()
-            return
-        if e.key() in (Qt.Key_Right, Qt.Key_D):
-            self.set_mode("from_start", animate=True, emit_signal=True)
-            e.accept()
-            return
-        if e.key() in (Qt.Key_Return, Qt.Key_Enter, Qt.Key_Space):
-            self.set_mode("from_start" if self._mode == "after_prev" else "after_prev", animate=True, emit_signal=True)
-            e.accept()
-            return
-        super().keyPressEvent(e)
+    _MODES = ("time", "event")
+    _LABELS = ("Время", "Событие")
 
-    def paintEvent(self, _):
-        p = QPainter(self)
-        p.setRenderHint(QPainter.Antialiasing, True)
 
-        r = self.rect().adjusted(1, 1, -1, -1)
-        if r.width() <= 8 or r.height() <= 8:
-            return
+class AreaModeSlider(_TwoStateSlider):
+    """Area action mode: screen / text."""
 
-        enabled = self.isEnabled()
-        track_bg = QColor("#141821")
-        track_border = QColor("#2a3447")
-        thumb_bg = QColor("#284162")
-        thumb_border = QColor("#4d78ad")
-        text_on = QColor("#f4f8ff")
-        text_off = QColor("#a9b3c7")
-        if not enabled:
-            track_bg = QColor("#11161f")
-            track_border = QColor("#1f2633")
-            thumb_bg = QColor("#1d2a3c")
-            thumb_border = QColor("#31465f")
-            text_on = QColor("#92a0b5")
-            text_off = QColor("#6f7f95")
+    _MODES = ("screen", "text")
+    _LABELS = ("Экран", "Текст")
 
-        p.setPen(QPen(track_border, 1))
-        p.setBrush(track_bg)
-        p.drawRoundedRect(r, 10, 10)
 
-        pad = 3
-        inner = r.adjusted(pad, pad, -pad, -pad)
-        half_w = max(1, inner.width() // 2)
-        thumb_w = half_w
-        thumb_x = int(round(inner.left() + (inner.width() - thumb_w) * float(self._pos)))
-        thumb = QRect(thumb_x, inner.top(), thumb_w, inner.height())
+class LongActivationSlider(_TwoStateSlider):
+    """Long-press item activation mode: after_prev / from_start."""
 
-        p.setPen(QPen(thumb_border, 1))
-        p.setBrush(thumb_bg)
-        p.drawRoundedRect(thumb, 8, 8)
+    _MODES = ("after_prev", "from_start")
+    _LABELS = ("После предыдущего", "От старта действия")
+    _TRACK_RADIUS = 10
+    _THUMB_RADIUS = 8
+    _MIN_HEIGHT = 30
+    _ANIM_MS = 180
+    _SIZE_HINT = (360, 32)
 
-        left = QRect(inner.left(), inner.top(), half_w, inner.height())
-        right = QRect(inner.left() + half_w, inner.top(), inner.width() - half_w, inner.height())
 
-        p.setPen(text_on if self._mode == "after_prev" else text_off)
-        p.drawText(left, Qt.AlignCenter, i18n.tr(self._labels["after_prev"]))
-        p.setPen(text_on if self._mode == "from_start" else text_off)
-        p.drawText(right, Qt.AlignCenter, i18n.tr(self._labels["from_start"]))
 
+# ---- Main UI ----
+# Confirm dialog buttons (_show_dark_info_dialog).
+_RED_BTN_QSS = (
+    "QPushButton { background: #612121; border: 1px solid #7e2d2d; color: #f4dede; }"
+    "QPushButton:hover { background: #742828; }"
+    "QPushButton:pressed { background: #4f1a1a; }"
+    "QPushButton:focus { outline: none; }"
+)
+_GREEN_BTN_QSS = (
+    "QPushButton { background: #1f5a35; border: 1px solid #2d7747; color: #dff4e7; }"
+    "QPushButton:hover { background: #266d41; }"
+    "QPushButton:pressed { background: #184a2b; }"
+    "QPushButton:focus { outline: none; }"
+)
 
+# Action table row backgrounds (re-applied on every highlight step while a macro runs).
+_ROW_BG_ERROR = QColor(180, 60, 60, 150)
+_ROW_BG_CURRENT = QColor(80, 110, 180, 120)
+_ROW_BG_ANCHOR = QColor(60, 100, 80, 120)
 
-# ---- Main UI ----
 class MainWindow(QMainWindow):
     class ClickableGroupBox(QGroupBox):
         """QGroupBox, который сворачивается/разворачивается кликом по заголовку."""
@@ -717,8 +505,8 @@ class MainWindow(QMainWindow):
             if style is not None:
                 style.unpolish(self)
                 style.polish(self)
+            # update() is coalesced into the first expose paint; repaint() would paint the whole tree twice
             self.update()
-            self.repaint()
         if getattr(self, "_dark_titlebar_done", False):
             return
         self._dark_titlebar_done = True
@@ -750,20 +538,8 @@ class MainWindow(QMainWindow):
         row = QHBoxLayout()
         row.addStretch(1)
 
-        red_btn_style = (
-            "QPushButton { background: #612121; border: 1px solid #7e2d2d; color: #f4dede; }"
-            "QPushButton:hover { background: #742828; }"
-            "QPushButton:pressed { background: #4f1a1a; }"
-            "QPushButton:focus { outline: none; }"
-        )
-        green_btn_style = (
-            "QPushButton { background: #1f5a35; border: 1px solid #2d7747; color: #dff4e7; }"
-            "QPushButton:hover { background: #266d41; }"
-            "QPushButton:pressed { background: #184a2b; }"
-            "QPushButton:focus { outline: none; }"
-        )
-        cancel_style = green_btn_style if danger_accept else red_btn_style
-        accept_style = red_btn_style if danger_accept else green_btn_style
+        cancel_style = _GREEN_BTN_QSS if danger_accept else _RED_BTN_QSS
+        accept_style = _RED_BTN_QSS if danger_accept else _GREEN_BTN_QSS
 
         btn_cancel = QPushButton(reject_text)
         btn_cancel.setStyleSheet(cancel_style)
@@ -776,13 +552,13 @@ class MainWindow(QMainWindow):
         row.addWidget(btn_ok)
         lay.addLayout(row)
 
-        i18n.retranslate_widget_tree(dlg)
+        # title/label/button texts are translated by the Qt hooks as they are set
         return dlg.exec() == QDialog.Accepted
 
     def _prepare_dark_dialog(self, dlg: QDialog):
         if dlg is None:
             return
-        dlg.setStyleSheet(self.styleSheet())
+        dlg.setStyleSheet(getattr(self, "_main_qss", None) or self.styleSheet())
         dlg.setAttribute(Qt.WA_NativeWindow, True)
         dlg.winId()
         self._apply_dark_titlebar_widget(dlg)
@@ -860,21 +636,31 @@ class MainWindow(QMainWindow):
         ok = dlg.exec() == QDialog.Accepted
         return dlg.textValue(), ok
 
-    def _read_settings_payload(self) -> Dict[str, Any]:
-        cached = getattr(self, "_settings_payload_cache", None)
-        if isinstance(cached, dict):
-            return dict(cached)
+    @staticmethod
+    def _settings_file_stamp() -> Optional[Tuple[int, int]]:
         try:
-            if config.SETTINGS_PATH.exists():
+            st = config.SETTINGS_PATH.stat()
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _read_settings_payload(self) -> Mapping[str, Any]:
+        """settings.json as a read-only mapping; re-parsed only when the file's mtime/size change."""
+        stamp = self._settings_file_stamp()
+        cached = getattr(self, "_settings_payload_cache", None)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        payload: Any = {}
+        if stamp is not None:
+            try:
                 payload = json.loads(config.SETTINGS_PATH.read_text(encoding="utf-8"))
-            else:
+            except Exception:
                 payload = {}
-        except Exception:
-            payload = {}
         if not isinstance(payload, dict):
             payload = {}
-        self._settings_payload_cache = dict(payload)
-        return dict(payload)
+        view = MappingProxyType(payload)
+        self._settings_payload_cache = (stamp, view)
+        return view
 
     def _retranslate_all_ui(self):
         i18n.retranslate_widget_tree(self)
@@ -2398,11 +2184,12 @@ class MainWindow(QMainWindow):
     def _set_row_bg(self, row: int, color: Optional[QColor]):
         if row < 0 or row >= self.actions_table.rowCount():
             return
+        brush = QBrush(color) if color else QBrush()  # setBackground copies it
         for c in range(self.actions_table.columnCount()):
             it = self.actions_table.item(row, c)
             if not it:
                 continue
-            it.setBackground(QBrush(color) if color else QBrush())
+            it.setBackground(brush)
 
     def _set_row_font_bold(self, row: int, bold: bool):
         if row < 0 or row >= self.actions_table.rowCount():
@@ -2466,11 +2253,11 @@ class MainWindow(QMainWindow):
         if row < 0 or row >= self.actions_table.rowCount():
             return
         if row in self._error_rows:
-            self._set_row_bg(row, QColor(180, 60, 60, 150))  # красный
+            self._set_row_bg(row, _ROW_BG_ERROR)  # красный
         elif self._highlighted_row == row:
-            self._set_row_bg(row, QColor(80, 110, 180, 120))  # синий
+            self._set_row_bg(row, _ROW_BG_CURRENT)  # синий
         elif self._is_anchor_row(row):
-            self._set_row_bg(row, QColor(60, 100, 80, 120))
+            self._set_row_bg(row, _ROW_BG_ANCHOR)
         else:
             self._set_row_bg(row, None)
         self._set_row_font_bold(row, self._params_row == row)
@@ -3827,13 +3614,16 @@ class MainWindow(QMainWindow):
     def _on_meter_stopped(self):
         self.btn_measure_toggle.setText("▶ Старт замера")
 
-    def _on_meter_interval(self, dt_sec: float, key_name: str, idx: int):
-        ms = dt_sec * 1000.0
+    def _on_meter_interval_batch(self, batch: list):
+        if not batch:
+            return
 
-        self.measure_table.insertRow(0)
-        self.measure_table.setItem(0, 0, QTableWidgetItem(str(idx)))
-        self.measure_table.setItem(0, 1, QTableWidgetItem(f"{ms:.1f}"))
-        self.measure_table.setItem(0, 2, QTableWidgetItem(key_name))
+        for dt_sec, key_name, idx in batch:
+            ms = dt_sec * 1000.0
+            self.measure_table.insertRow(0)
+            self.measure_table.setItem(0, 0, QTableWidgetItem(str(idx)))
+            self.measure_table.setItem(0, 1, QTableWidgetItem(f"{ms:.1f}"))
+            self.measure_table.setItem(0, 2, QTableWidgetItem(key_name))
         self.measure_table.scrollToTop()
 
         # оставим только последние 50 строк, чтобы таблица не разрасталась
@@ -3841,9 +3631,10 @@ class MainWindow(QMainWindow):
             self.measure_table.removeRow(self.measure_table.rowCount() - 1)
 
         # среднее
-        vals = self.meter.intervals
+        ms = batch[-1][0] * 1000.0
+        vals = self.meter.intervals  # ns
         if vals:
-            avg = sum(vals) / len(vals)
+            avg = sum(vals) / len(vals) * 1e-9
             self._measure_avg = avg
             self.lbl_measure.setText(
                 f"Последнее: {ms:.1f} мс | Среднее: {avg * 1000.0:.1f} мс (N={len(vals)})"
@@ -3965,8 +3756,8 @@ class MainWindow(QMainWindow):
         super().__init__()
         self.setAttribute(Qt.WA_StyledBackground, True)
         self.setAutoFillBackground(True)
-        self._settings_payload_cache: Dict[str, Any] = self._read_settings_payload()
-        self._ui_language: str = i18n.normalize_language(self._settings_payload_cache.get("language"))
+        self._settings_payload_cache: Optional[Tuple[Optional[Tuple[int, int]], Mapping[str, Any]]] = None
+        self._ui_language: str = i18n.normalize_language(self._read_settings_payload().get("language"))
         self._ui_ready_for_language_change: bool = False
         i18n.set_language(self._ui_language)
 
@@ -4030,7 +3821,7 @@ class MainWindow(QMainWindow):
         self.hotkeys.start()
         self._playing = False
         self.meter = IntervalMeter()
-        self.meter.interval.connect(self._on_meter_interval)
+        self.meter.interval_batch.connect(self._on_meter_interval_batch)
         self.meter.status.connect(self._on_meter_status)
         self.meter.stopped.connect(self._on_meter_stopped)
 
@@ -5041,7 +4832,7 @@ class MainWindow(QMainWindow):
         layout.addWidget(self.main_splitter, 1)
 
     def _apply_style(self):
-        self.setStyleSheet("""
+        qss = """
             /* 1) Чтобы окно (центральный QWidget тоже) не было белым */
             QMainWindow, QWidget { background: #0f1115; }
 
@@ -5340,14 +5131,17 @@ class MainWindow(QMainWindow):
             QGroupBox::indicator { width: 0px; height: 0px; }
 
 
-        """)
+        """
+        self.setStyleSheet(qss)
+        # keep our own copy: dialogs reuse it without reading the sheet back out of Qt
+        self._main_qss = qss
         # Диалоги отдельные от main window, поэтому дублируем стиль явно.
         if hasattr(self, "repeat_dialog"):
-            self.repeat_dialog.setStyleSheet(self.styleSheet())
+            self.repeat_dialog.setStyleSheet(qss)
         if hasattr(self, "measure_dialog"):
-            self.measure_dialog.setStyleSheet(self.styleSheet())
+            self.measure_dialog.setStyleSheet(qss)
         if hasattr(self, "app_settings_dialog"):
-            self.app_settings_dialog.setStyleSheet(self.styleSheet())
+            self.app_settings_dialog.setStyleSheet(qss)
 
     # ---- Records ops ----
     def create_record(self):
@@ -6780,7 +6574,7 @@ class MainWindow(QMainWindow):
                 "language": i18n.normalize_language(getattr(self, "_ui_language", i18n.DEFAULT_LANGUAGE)),
             }
             config.SETTINGS_PATH.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
-            self._settings_payload_cache = dict(payload)
+            self._settings_payload_cache = (self._settings_file_stamp(), MappingProxyType(payload))
         except Exception:
             pass
 
@@ -14,6 +14,14 @@ from atari.core.models import KeyAction, MouseButtonName
 from atari.core.win32 import _is_windows, _win_activate_hwnd
 from atari.localization import i18n
 
+_MOD_KEYS = frozenset(("Shift", "Ctrl", "Alt", "Meta"))
+
+# Overlay paint colors: built once, the overlays repaint on every mouse move.
+_DIM_BRUSH = QBrush(QColor(0, 0, 0, 160))
+_FG_COLOR = QColor(255, 255, 255, 230)
+_FG_PEN_2PX = QPen(_FG_COLOR, 2)
+_FG_BRUSH = QBrush(_FG_COLOR)
+
 class AreaSelectOverlay(QWidget):
     accepted = Signal(QRect)  # global rect
     canceled = Signal()
@@ -256,7 +264,7 @@ class AreaSelectOverlay(QWidget):
 
         # dark overlay
         p.setPen(Qt.NoPen)
-        p.setBrush(QColor(0, 0, 0, 160))
+        p.setBrush(_DIM_BRUSH)
         p.drawRect(self.rect())
 
         # clear selection "hole"
@@ -266,20 +274,20 @@ class AreaSelectOverlay(QWidget):
             p.setCompositionMode(QPainter.CompositionMode_SourceOver)
 
             # border + handles
-            p.setPen(QPen(QColor(255, 255, 255, 230), 2))
+            p.setPen(_FG_PEN_2PX)
             p.setBrush(Qt.NoBrush)
             p.drawRect(self._rect_local)
 
             # handles
             hs = self._handle_size
-            p.setBrush(QBrush(QColor(255, 255, 255, 230)))
+            p.setBrush(_FG_BRUSH)
             for pt in [self._rect_local.topLeft(), QPoint(self._rect_local.right(), self._rect_local.top()),
                        QPoint(self._rect_local.left(), self._rect_local.bottom()), self._rect_local.bottomRight()]:
                 hr = QRect(pt - QPoint(hs // 2, hs // 2), QSize(hs, hs))
                 p.drawRect(hr)
 
         # help text
-        p.setPen(QColor(255, 255, 255, 230))
+        p.setPen(_FG_COLOR)
         p.setFont(QFont("Segoe UI", 12))
         p.drawText(QRect(20, 20, 560, 180), Qt.TextWordWrap, i18n.tr(self._help))
 
@@ -430,7 +438,7 @@ class KeyCaptureOverlay(QWidget):
                 self.canceled.emit()
                 return
 
-        if name in ("Shift", "Ctrl", "Alt", "Meta"):
+        if name in _MOD_KEYS:
             if pressed:
                 self._pressed_mods.add(name)
             else:
@@ -553,7 +561,7 @@ class KeyCaptureOverlay(QWidget):
                 base = None
                 mods = set()
                 for k in initial.keys:
-                    if k in ("Shift", "Ctrl", "Alt", "Meta"):
+                    if k in _MOD_KEYS:
                         mods.add(k)
                     else:
                         base = k
@@ -669,7 +677,7 @@ class KeyCaptureOverlay(QWidget):
 
         # dark overlay
         p.setPen(Qt.NoPen)
-        p.setBrush(QColor(0, 0, 0, 160))
+        p.setBrush(_DIM_BRUSH)
         p.drawRect(self.rect())
 
         # clear area hole (like area selection mode)
@@ -677,12 +685,12 @@ class KeyCaptureOverlay(QWidget):
             p.setCompositionMode(QPainter.CompositionMode_Clear)
             p.drawRect(self._area_local)
             p.setCompositionMode(QPainter.CompositionMode_SourceOver)
-            p.setPen(QPen(QColor(255, 255, 255, 230), 2))
+            p.setPen(_FG_PEN_2PX)
             p.setBrush(Qt.NoBrush)
             p.drawRect(self._area_local)
 
         # text
-        p.setPen(QColor(255, 255, 255, 230))
+        p.setPen(_FG_COLOR)
         p.setFont(QFont("Segoe UI", 12))
         p.drawText(QRect(20, 20, 640, 160), Qt.TextWordWrap, i18n.tr(self._help))
 